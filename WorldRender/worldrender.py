@@ -1,7 +1,7 @@
 """
     @author RazrCraft
     @create date 2026-03-08 21:32:37
-    @modify date 2026-03-09 01:55:56
+    @modify date 2026-10-17 20:41:15
     @desc World rendering for Minecraft 1.21.11+
  """
 from typing import overload
@@ -41,6 +41,13 @@ def _new_id() -> int:
     _next_id += 1
     return _next_id
 
+def _vec3(x: float, y: float, z: float):
+    return Vec3(JavaFloat(x), JavaFloat(y), JavaFloat(z))
+
+def _style(r: int, g: int, b: int, a: int, filled: bool):
+    color = ARGB.color(a, r, g, b)
+    return GizmoStyle.fill(color) if filled else GizmoStyle.stroke(color)
+
 class WorldRender:
     def __init__(self, max_size: int = 1024):
         self.max_size = max_size
@@ -60,23 +67,35 @@ class WorldRender:
         self.circles_idx = {}   # {(x, y, z): id}
         self.rects       = {}   # {id: (x1,y1,z1, x2,y2,z2, x3,y3,z3, x4,y4,z4, r, g, b, a, filled, always_on_top)}
         self.rects_idx   = {}   # {((x1,y1,z1),(x2,y2,z2),(x3,y3,z3),(x4,y4,z4)): id}
+        # Java objects for each entry, built once in add_* so rendering only emits gizmos
+        self.boxes_render   = {}   # {id: (AABB, GizmoStyle, always_on_top)}
+        self.blocks_render  = {}   # {id: (BlockPos, GizmoStyle, always_on_top)}
+        self.texts_render   = {}   # {id: (text, Vec3, TextGizmo.Style, always_on_top)}
+        self.points_render  = {}   # {id: (Vec3, color, size, always_on_top)}
+        self.lines_render   = {}   # {id: (Vec3, Vec3, color, width, always_on_top)}
+        self.arrows_render  = {}   # {id: (Vec3, Vec3, color, width, always_on_top)}
+        self.circles_render = {}   # {id: (Vec3, radius, GizmoStyle, always_on_top)}
+        self.rects_render   = {}   # {id: (Vec3, Vec3, Vec3, Vec3, GizmoStyle, always_on_top)}
 
     # ── Internal helpers ──────────────────────────────────────────────────────
 
-    def _evict(self, data: dict, idx: dict, key_fn) -> None:
+    def _evict(self, data: dict, idx: dict, render: dict, key_fn) -> None:
         old_id, old_entry = next(iter(data.items()))
         del idx[key_fn(old_entry)]
         del data[old_id]
+        del render[old_id]
 
-    def _remove_by_id(self, data: dict, idx: dict, key_fn, eid: int) -> None:
+    def _remove_by_id(self, data: dict, idx: dict, render: dict, key_fn, eid: int) -> None:
         entry = data[eid]
         del idx[key_fn(entry)]
         del data[eid]
+        del render[eid]
 
-    def _remove_by_key(self, data: dict, idx: dict, coords_key) -> None:
+    def _remove_by_key(self, data: dict, idx: dict, render: dict, coords_key) -> None:
         eid = idx[coords_key]
         del idx[coords_key]
         del data[eid]
+        del render[eid]
 
     # ── Boxes ─────────────────────────────────────────────────────────────────
 
@@ -86,20 +105,23 @@ class WorldRender:
         key = (x1, y1, z1, x2, y2, z2)
         if key in self.boxes_idx:
             del self.boxes[self.boxes_idx[key]]
+            del self.boxes_render[self.boxes_idx[key]]
             del self.boxes_idx[key]
         eid = _new_id()
         self.boxes[eid] = (x1, y1, z1, x2, y2, z2, r, g, b, a, always_on_top)
+        self.boxes_render[eid] = (AABB(x1, y1, z1, x2, y2, z2), GizmoStyle.stroke(ARGB.color(a, r, g, b)),
+                                  always_on_top)
         self.boxes_idx[key] = eid
         if len(self.boxes) > self.max_size:
-            self._evict(self.boxes, self.boxes_idx, lambda e: (e[0], e[1], e[2], e[3], e[4], e[5]))
+            self._evict(self.boxes, self.boxes_idx, self.boxes_render, lambda e: (e[0], e[1], e[2], e[3], e[4], e[5]))
         return eid
 
     def remove_box(self, x1: int = None, y1: int = None, z1: int = None,
                    x2: int = None, y2: int = None, z2: int = None, id: int = None) -> None:
         if id is not None:
-            self._remove_by_id(self.boxes, self.boxes_idx, lambda e: (e[0], e[1], e[2], e[3], e[4], e[5]), id)
+            self._remove_by_id(self.boxes, self.boxes_idx, self.boxes_render, lambda e: (e[0], e[1], e[2], e[3], e[4], e[5]), id)
         else:
-            self._remove_by_key(self.boxes, self.boxes_idx, (x1, y1, z1, x2, y2, z2))
+            self._remove_by_key(self.boxes, self.boxes_idx, self.boxes_render, (x1, y1, z1, x2, y2, z2))
 
     def get_box_list(self) -> dict:
         return self.boxes
@@ -112,19 +134,21 @@ class WorldRender:
         key = (x, y, z)
         if key in self.blocks_idx:
             del self.blocks[self.blocks_idx[key]]
+            del self.blocks_render[self.blocks_idx[key]]
             del self.blocks_idx[key]
         eid = _new_id()
         self.blocks[eid] = (x, y, z, r, g, b, a, always_on_top)
+        self.blocks_render[eid] = (BlockPos(x, y, z), GizmoStyle.stroke(ARGB.color(a, r, g, b)), always_on_top)
         self.blocks_idx[key] = eid
         if len(self.blocks) > self.max_size:
-            self._evict(self.blocks, self.blocks_idx, lambda e: (e[0], e[1], e[2]))
+            self._evict(self.blocks, self.blocks_idx, self.blocks_render, lambda e: (e[0], e[1], e[2]))
         return eid
 
     def remove_block(self, x: int = None, y: int = None, z: int = None, id: int = None) -> None:
         if id is not None:
-            self._remove_by_id(self.blocks, self.blocks_idx, lambda e: (e[0], e[1], e[2]), id)
+            self._remove_by_id(self.blocks, self.blocks_idx, self.blocks_render, lambda e: (e[0], e[1], e[2]), id)
         else:
-            self._remove_by_key(self.blocks, self.blocks_idx, (x, y, z))
+            self._remove_by_key(self.blocks, self.blocks_idx, self.blocks_render, (x, y, z))
 
     def get_block_list(self) -> dict:
         return self.blocks
@@ -137,19 +161,22 @@ class WorldRender:
         key = (x, y, z)
         if key in self.texts_idx:
             del self.texts[self.texts_idx[key]]
+            del self.texts_render[self.texts_idx[key]]
             del self.texts_idx[key]
         eid = _new_id()
         self.texts[eid] = (x, y, z, text, r, g, b, a, size, always_on_top)
+        style = TextGizmo_Style.forColorAndCentered(ARGB.color(a, r, g, b)).withScale(size)
+        self.texts_render[eid] = (text, _vec3(x, y, z), style, always_on_top)
         self.texts_idx[key] = eid
         if len(self.texts) > self.max_size:
-            self._evict(self.texts, self.texts_idx, lambda e: (e[0], e[1], e[2]))
+            self._evict(self.texts, self.texts_idx, self.texts_render, lambda e: (e[0], e[1], e[2]))
         return eid
 
     def remove_text(self, x: float = None, y: float = None, z: float = None, id: int = None) -> None:
         if id is not None:
-            self._remove_by_id(self.texts, self.texts_idx, lambda e: (e[0], e[1], e[2]), id)
+            self._remove_by_id(self.texts, self.texts_idx, self.texts_render, lambda e: (e[0], e[1], e[2]), id)
         else:
-            self._remove_by_key(self.texts, self.texts_idx, (x, y, z))
+            self._remove_by_key(self.texts, self.texts_idx, self.texts_render, (x, y, z))
 
     def get_text_list(self) -> dict:
         return self.texts
@@ -162,19 +189,21 @@ class WorldRender:
         key = (x, y, z)
         if key in self.points_idx:
             del self.points[self.points_idx[key]]
+            del self.points_render[self.points_idx[key]]
             del self.points_idx[key]
         eid = _new_id()
         self.points[eid] = (x, y, z, r, g, b, a, size, always_on_top)
+        self.points_render[eid] = (_vec3(x, y, z), ARGB.color(a, r, g, b), JavaFloat(size), always_on_top)
         self.points_idx[key] = eid
         if len(self.points) > self.max_size:
-            self._evict(self.points, self.points_idx, lambda e: (e[0], e[1], e[2]))
+            self._evict(self.points, self.points_idx, self.points_render, lambda e: (e[0], e[1], e[2]))
         return eid
 
     def remove_point(self, x: float = None, y: float = None, z: float = None, id: int = None) -> None:
         if id is not None:
-            self._remove_by_id(self.points, self.points_idx, lambda e: (e[0], e[1], e[2]), id)
+            self._remove_by_id(self.points, self.points_idx, self.points_render, lambda e: (e[0], e[1], e[2]), id)
         else:
-            self._remove_by_key(self.points, self.points_idx, (x, y, z))
+            self._remove_by_key(self.points, self.points_idx, self.points_render, (x, y, z))
 
     def get_point_list(self) -> dict:
         return self.points
@@ -188,20 +217,23 @@ class WorldRender:
         key = ((x1, y1, z1), (x2, y2, z2))
         if key in self.lines_idx:
             del self.lines[self.lines_idx[key]]
+            del self.lines_render[self.lines_idx[key]]
             del self.lines_idx[key]
         eid = _new_id()
         self.lines[eid] = (x1, y1, z1, x2, y2, z2, r, g, b, a, width, always_on_top)
+        self.lines_render[eid] = (_vec3(x1, y1, z1), _vec3(x2, y2, z2), ARGB.color(a, r, g, b),
+                                  JavaFloat(width), always_on_top)
         self.lines_idx[key] = eid
         if len(self.lines) > self.max_size:
-            self._evict(self.lines, self.lines_idx, lambda e: ((e[0], e[1], e[2]), (e[3], e[4], e[5])))
+            self._evict(self.lines, self.lines_idx, self.lines_render, lambda e: ((e[0], e[1], e[2]), (e[3], e[4], e[5])))
         return eid
 
     def remove_line(self, x1: float = None, y1: float = None, z1: float = None,
                     x2: float = None, y2: float = None, z2: float = None, id: int = None) -> None:
         if id is not None:
-            self._remove_by_id(self.lines, self.lines_idx, lambda e: ((e[0], e[1], e[2]), (e[3], e[4], e[5])), id)
+            self._remove_by_id(self.lines, self.lines_idx, self.lines_render, lambda e: ((e[0], e[1], e[2]), (e[3], e[4], e[5])), id)
         else:
-            self._remove_by_key(self.lines, self.lines_idx, ((x1, y1, z1), (x2, y2, z2)))
+            self._remove_by_key(self.lines, self.lines_idx, self.lines_render, ((x1, y1, z1), (x2, y2, z2)))
 
     def get_line_list(self) -> dict:
         return self.lines
@@ -215,20 +247,23 @@ class WorldRender:
         key = ((x1, y1, z1), (x2, y2, z2))
         if key in self.arrows_idx:
             del self.arrows[self.arrows_idx[key]]
+            del self.arrows_render[self.arrows_idx[key]]
             del self.arrows_idx[key]
         eid = _new_id()
         self.arrows[eid] = (x1, y1, z1, x2, y2, z2, r, g, b, a, width, always_on_top)
+        self.arrows_render[eid] = (_vec3(x1, y1, z1), _vec3(x2, y2, z2), ARGB.color(a, r, g, b),
+                                   JavaFloat(width), always_on_top)
         self.arrows_idx[key] = eid
         if len(self.arrows) > self.max_size:
-            self._evict(self.arrows, self.arrows_idx, lambda e: ((e[0], e[1], e[2]), (e[3], e[4], e[5])))
+            self._evict(self.arrows, self.arrows_idx, self.arrows_render, lambda e: ((e[0], e[1], e[2]), (e[3], e[4], e[5])))
         return eid
 
     def remove_arrow(self, x1: float = None, y1: float = None, z1: float = None,
                      x2: float = None, y2: float = None, z2: float = None, id: int = None) -> None:
         if id is not None:
-            self._remove_by_id(self.arrows, self.arrows_idx, lambda e: ((e[0], e[1], e[2]), (e[3], e[4], e[5])), id)
+            self._remove_by_id(self.arrows, self.arrows_idx, self.arrows_render, lambda e: ((e[0], e[1], e[2]), (e[3], e[4], e[5])), id)
         else:
-            self._remove_by_key(self.arrows, self.arrows_idx, ((x1, y1, z1), (x2, y2, z2)))
+            self._remove_by_key(self.arrows, self.arrows_idx, self.arrows_render, ((x1, y1, z1), (x2, y2, z2)))
 
     def get_arrow_list(self) -> dict:
         return self.arrows
@@ -241,19 +276,21 @@ class WorldRender:
         key = (x, y, z)
         if key in self.circles_idx:
             del self.circles[self.circles_idx[key]]
+            del self.circles_render[self.circles_idx[key]]
             del self.circles_idx[key]
         eid = _new_id()
         self.circles[eid] = (x, y, z, radius, r, g, b, a, filled, always_on_top)
+        self.circles_render[eid] = (_vec3(x, y, z), JavaFloat(radius), _style(r, g, b, a, filled), always_on_top)
         self.circles_idx[key] = eid
         if len(self.circles) > self.max_size:
-            self._evict(self.circles, self.circles_idx, lambda e: (e[0], e[1], e[2]))
+            self._evict(self.circles, self.circles_idx, self.circles_render, lambda e: (e[0], e[1], e[2]))
         return eid
 
     def remove_circle(self, x: float = None, y: float = None, z: float = None, id: int = None) -> None:
         if id is not None:
-            self._remove_by_id(self.circles, self.circles_idx, lambda e: (e[0], e[1], e[2]), id)
+            self._remove_by_id(self.circles, self.circles_idx, self.circles_render, lambda e: (e[0], e[1], e[2]), id)
         else:
-            self._remove_by_key(self.circles, self.circles_idx, (x, y, z))
+            self._remove_by_key(self.circles, self.circles_idx, self.circles_render, (x, y, z))
 
     def get_circle_list(self) -> dict:
         return self.circles
@@ -270,12 +307,15 @@ class WorldRender:
         key = ((x1, y1, z1), (x2, y2, z2), (x3, y3, z3), (x4, y4, z4))
         if key in self.rects_idx:
             del self.rects[self.rects_idx[key]]
+            del self.rects_render[self.rects_idx[key]]
             del self.rects_idx[key]
         eid = _new_id()
         self.rects[eid] = (x1, y1, z1, x2, y2, z2, x3, y3, z3, x4, y4, z4, r, g, b, a, filled, always_on_top)
+        self.rects_render[eid] = (_vec3(x1, y1, z1), _vec3(x2, y2, z2), _vec3(x3, y3, z3), _vec3(x4, y4, z4),
+                                  _style(r, g, b, a, filled), always_on_top)
         self.rects_idx[key] = eid
         if len(self.rects) > self.max_size:
-            self._evict(self.rects, self.rects_idx,
+            self._evict(self.rects, self.rects_idx, self.rects_render,
                         lambda e: ((e[0], e[1], e[2]), (e[3], e[4], e[5]), (e[6], e[7], e[8]), (e[9], e[10], e[11])))
         return eid
 
@@ -286,11 +326,11 @@ class WorldRender:
                     x4: float = None, y4: float = None, z4: float = None,
                     id: int = None) -> None:
         if id is not None:
-            self._remove_by_id(self.rects, self.rects_idx,
+            self._remove_by_id(self.rects, self.rects_idx, self.rects_render,
                                 lambda e: ((e[0], e[1], e[2]), (e[3], e[4], e[5]), (e[6], e[7], e[8]), (e[9], e[10], e[11])),
                                 id)
         else:
-            self._remove_by_key(self.rects, self.rects_idx,
+            self._remove_by_key(self.rects, self.rects_idx, self.rects_render,
                                  ((x1, y1, z1), (x2, y2, z2), (x3, y3, z3), (x4, y4, z4)))
 
     def get_rect_list(self) -> dict:
@@ -317,108 +357,89 @@ class WorldRender:
 _wr = WorldRender()
 
 def _render_boxes() -> None:
-    boxes = _wr.get_box_list()
+    boxes = _wr.boxes_render
     if not boxes:
         return
 
     for entry in boxes.values():
-        x1, y1, z1, x2, y2, z2, r, g, b, a, always_on_top = entry
-        color = ARGB.color(a, r, g, b)
-        gizmo = Gizmos.cuboid(AABB(x1, y1, z1, x2, y2, z2), GizmoStyle.stroke(color))
+        aabb, style, always_on_top = entry
+        gizmo = Gizmos.cuboid(aabb, style)
         if always_on_top:
             gizmo.setAlwaysOnTop()
 
 def _render_blocks() -> None:
-    blocks = _wr.get_block_list()
+    blocks = _wr.blocks_render
     if not blocks:
         return
 
     for entry in blocks.values():
-        x, y, z, r, g, b, a, always_on_top = entry
-        color = ARGB.color(a, r, g, b)
-        gizmo = Gizmos.cuboid(BlockPos(x, y, z), GizmoStyle.stroke(color))
+        pos, style, always_on_top = entry
+        gizmo = Gizmos.cuboid(pos, style)
         if always_on_top:
             gizmo.setAlwaysOnTop()
 
 def _render_texts() -> None:
-    texts = _wr.get_text_list()
+    texts = _wr.texts_render
     if not texts:
         return
 
     for entry in texts.values():
-        x, y, z, text, r, g, b, a, size, always_on_top = entry
-        color = ARGB.color(a, r, g, b)
-        style = TextGizmo_Style.forColorAndCentered(color).withScale(size)
-        gizmo = Gizmos.billboardText(text, Vec3(JavaFloat(x), JavaFloat(y), JavaFloat(z)), style)
+        text, pos, style, always_on_top = entry
+        gizmo = Gizmos.billboardText(text, pos, style)
         if always_on_top:
             gizmo.setAlwaysOnTop()
 
 def _render_points() -> None:
-    points = _wr.get_point_list()
+    points = _wr.points_render
     if not points:
         return
 
     for entry in points.values():
-        x, y, z, r, g, b, a, size, always_on_top = entry
-        color = ARGB.color(a, r, g, b)
-        gizmo = Gizmos.point(Vec3(JavaFloat(x), JavaFloat(y), JavaFloat(z)), color, JavaFloat(size))
+        pos, color, size, always_on_top = entry
+        gizmo = Gizmos.point(pos, color, size)
         if always_on_top:
             gizmo.setAlwaysOnTop()
 
 def _render_lines() -> None:
-    lines = _wr.get_line_list()
+    lines = _wr.lines_render
     if not lines:
         return
 
     for entry in lines.values():
-        x1, y1, z1, x2, y2, z2, r, g, b, a, width, always_on_top = entry
-        color = ARGB.color(a, r, g, b)
-        start = Vec3(JavaFloat(x1), JavaFloat(y1), JavaFloat(z1))
-        end   = Vec3(JavaFloat(x2), JavaFloat(y2), JavaFloat(z2))
-        gizmo = Gizmos.line(start, end, color, JavaFloat(width))
+        start, end, color, width, always_on_top = entry
+        gizmo = Gizmos.line(start, end, color, width)
         if always_on_top:
             gizmo.setAlwaysOnTop()
 
 def _render_arrows() -> None:
-    arrows = _wr.get_arrow_list()
+    arrows = _wr.arrows_render
     if not arrows:
         return
 
     for entry in arrows.values():
-        x1, y1, z1, x2, y2, z2, r, g, b, a, width, always_on_top = entry
-        color = ARGB.color(a, r, g, b)
-        start = Vec3(JavaFloat(x1), JavaFloat(y1), JavaFloat(z1))
-        end   = Vec3(JavaFloat(x2), JavaFloat(y2), JavaFloat(z2))
-        gizmo = Gizmos.arrow(start, end, color, JavaFloat(width))
+        start, end, color, width, always_on_top = entry
+        gizmo = Gizmos.arrow(start, end, color, width)
         if always_on_top:
             gizmo.setAlwaysOnTop()
 
 def _render_circles() -> None:
-    circles = _wr.get_circle_list()
+    circles = _wr.circles_render
     if not circles:
         return
 
     for entry in circles.values():
-        x, y, z, radius, r, g, b, a, filled, always_on_top = entry
-        color = ARGB.color(a, r, g, b)
-        style = GizmoStyle.fill(color) if filled else GizmoStyle.stroke(color)
-        gizmo = Gizmos.circle(Vec3(JavaFloat(x), JavaFloat(y), JavaFloat(z)), JavaFloat(radius), style)
+        center, radius, style, always_on_top = entry
+        gizmo = Gizmos.circle(center, radius, style)
         if always_on_top:
             gizmo.setAlwaysOnTop()
 
 def _render_rects() -> None:
-    rects = _wr.get_rect_list()
+    rects = _wr.rects_render
     if not rects:
         return
 
     for entry in rects.values():
-        x1, y1, z1, x2, y2, z2, x3, y3, z3, x4, y4, z4, r, g, b, a, filled, always_on_top = entry
-        color = ARGB.color(a, r, g, b)
-        style = GizmoStyle.fill(color) if filled else GizmoStyle.stroke(color)
-        a_pos = Vec3(JavaFloat(x1), JavaFloat(y1), JavaFloat(z1))
-        b_pos = Vec3(JavaFloat(x2), JavaFloat(y2), JavaFloat(z2))
-        c_pos = Vec3(JavaFloat(x3), JavaFloat(y3), JavaFloat(z3))
-        d_pos = Vec3(JavaFloat(x4), JavaFloat(y4), JavaFloat(z4))
+        a_pos, b_pos, c_pos, d_pos, style, always_on_top = entry
         gizmo = Gizmos.rect(a_pos, b_pos, c_pos, d_pos, style)
         if always_on_top:
             gizmo.setAlwaysOnTop()
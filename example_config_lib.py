@@ -28,6 +28,12 @@ def main():
     data = cfg.to_dict()
     print("Full config as dict:", data)
 
+    # Group related updates into a single write (rolled back on exception)
+    with cfg.batch():
+        cfg.bot.x = 10
+        cfg.bot.y = 64
+        cfg.bot.state = "mining"
+
     # Delete a key
     del cfg.version
 
@@ -1,119 +1,498 @@
 """
     @author RazrCraft
     @create date 2025-09-18 23:31:14
-    @modify date 2025-09-23 14:35:05
+    @modify date 2026-10-18 00:26:08
     @desc Simple JSON-backed configuration library
  """
 
 from __future__ import annotations
+import asyncio
+import atexit
 import json
 import os
+import sqlite3
+import sys
 import tempfile
-from typing import Any, Dict
+import threading
+import time
+import weakref
+from collections.abc import Mapping, Sequence
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator
+
+if os.name == "nt":
+    import msvcrt
+else:
+    import fcntl
 
 
 class ConfigError(Exception):
     """Generic configuration error."""
 
 
+_MISSING = object()
+_VALUE = object()  # marks a node whose path is blocked by a non-dict value
+
+
+def _deep_copy(value: Any) -> Any:
+    """Deep copy JSON-like data (dicts and lists are copied, leaves are shared)."""
+    if isinstance(value, dict):
+        return {k: _deep_copy(v) if isinstance(v, (dict, list)) else v for k, v in value.items()}
+    if isinstance(value, list):
+        return [_deep_copy(v) if isinstance(v, (dict, list)) else v for v in value]
+    return value
+
+
+class FrozenMapping(Mapping):
+    """
+    Read-only view of a config dict, as returned by Config.snapshot().
+
+    Nested dicts are returned as FrozenMapping and lists as FrozenList views,
+    created on access, so the snapshot shares its data with the config.
+    """
+    __slots__ = ("_d", "__weakref__")
+
+    def __init__(self, d: dict):
+        self._d = d
+
+    def __getitem__(self, key: str) -> Any:
+        return _freeze(self._d[key])
+
+    def __iter__(self):
+        return iter(self._d)
+
+    def __len__(self) -> int:
+        return len(self._d)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._d
+
+    def __getattr__(self, name: str) -> Any:
+        # attribute-style reads, like Config/ConfigNode
+        if name.startswith("_"):
+            raise AttributeError(name)
+        try:
+            return _freeze(self._d[name])
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def to_dict(self) -> dict:
+        """Return a mutable deep copy."""
+        return _deep_copy(self._d)
+
+    def __repr__(self):
+        return f"FrozenMapping({self._d!r})"
+
+
+class FrozenList(Sequence):
+    """Read-only view of a list inside a config snapshot."""
+    __slots__ = ("_l",)
+
+    def __init__(self, items: list):
+        self._l = items
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return FrozenList(self._l[index])
+        return _freeze(self._l[index])
+
+    def __len__(self) -> int:
+        return len(self._l)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, FrozenList):
+            other = other._l
+        return self._l == other
+
+    def __repr__(self):
+        return f"FrozenList({self._l!r})"
+
+
+def _freeze(value: Any) -> Any:
+    if isinstance(value, dict):
+        return FrozenMapping(value)
+    if isinstance(value, list):
+        return FrozenList(value)
+    return value
+
+
+_EMPTY_FROZEN = FrozenMapping({})
+
+
+def _stat_sig(st: os.stat_result) -> tuple[int, int, int]:
+    """Cheap change signature of a file: (mtime, size, inode)."""
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+def _diff(old: dict, new: dict, prefix: str, out: list) -> None:
+    """Append (dotted_path, old, new) for every changed leaf between two dicts."""
+    for key, a in old.items():
+        b = new.get(key, _MISSING)
+        path = prefix + key
+        if isinstance(a, dict) and isinstance(b, dict):
+            _diff(a, b, path + ".", out)
+        elif b is _MISSING:
+            out.append((path, a, None))
+        elif a != b or type(a) is not type(b):
+            out.append((path, a, b))
+    for key, b in new.items():
+        if key not in old:
+            out.append((prefix + key, None, b))
+
+
+def _apply_op(data: Dict[str, Any], path: list[str], value: Any) -> Dict[str, Any]:
+    """Apply one recorded change to data and return the (possibly new) root."""
+    if not path:
+        return data if value is _MISSING else value
+    d = data
+    for key in path[:-1]:
+        child = d.get(key)
+        if not isinstance(child, dict):
+            if value is _MISSING:
+                return data
+            child = d[key] = {}
+        d = child
+    if value is _MISSING:
+        d.pop(path[-1], None)
+    else:
+        d[path[-1]] = value
+    return data
+
+
+def _coalesce_ops(ops: list[dict]) -> list[dict]:
+    """Drop recorded changes overwritten by a later assignment to the same path or a parent path."""
+    if len(ops) < 2:
+        return ops
+    covered: set[tuple] = set()
+    kept = []
+    for op in reversed(ops):
+        path = tuple(op["p"])
+        if any(path[:i] in covered for i in range(len(path) + 1)):
+            continue
+        if "v" in op:
+            covered.add(path)
+        kept.append(op)
+    kept.reverse()
+    return kept
+
+
+_JSON_SCALARS = frozenset((str, int, float, bool, type(None)))
+
+
 def _is_json_serializable(value: Any) -> bool:
-    """Return True if value is JSON-serializable by the standard json module."""
+    """
+    Return True if value is JSON-serializable by the standard json module.
+
+    Walks containers checking types, which is several times faster than
+    serializing; unusual types (subclasses, ...) are left to json.dumps.
+    """
+    try:
+        return _json_ok(value)
+    except RecursionError:  # circular reference
+        return False
+
+
+def _json_ok(value: Any) -> bool:
+    cls = type(value)
+    if cls is list or cls is tuple:
+        if {type(item) for item in value} <= _JSON_SCALARS:
+            return True
+        return all(type(item) in _JSON_SCALARS or _json_ok(item) for item in value)
+    if cls is dict:
+        return all(type(k) in _JSON_SCALARS and (type(v) in _JSON_SCALARS or _json_ok(v))
+                   for k, v in value.items())
+    if cls in _JSON_SCALARS:
+        return True
     try:
         json.dumps(value)
         return True
-    except (TypeError, OverflowError):
+    except (TypeError, ValueError, OverflowError):
         return False
 
 
+class Field:
+    """
+    A typed setting in a Schema.
+
+    :param type: expected type or tuple of types (float also accepts ints,
+                 int does not accept bools)
+    :param default: value filled in when the key is missing
+    :param min: lower bound for numbers
+    :param max: upper bound for numbers
+    :param choices: allowed values
+    :param items: for lists, the type, Field or section dict of every element
+    :param nullable: also accept None
+    """
+    __slots__ = ("type", "default", "min", "max", "choices", "items", "nullable")
+
+    def __init__(self, type: type | tuple[type, ...], default: Any = _MISSING, *, min: Any = None,
+                 max: Any = None, choices: Any = None, items: Any = None, nullable: bool = False):
+        self.type = type
+        self.default = default
+        self.min = min
+        self.max = max
+        self.choices = choices
+        self.items = items
+        self.nullable = nullable
+
+    def __repr__(self):
+        return f"Field({self.type!r}, default={self.default!r})"
+
+
+class Schema:
+    """
+    Compiled schema for Config(schema=...).
+
+    The spec maps keys to a Field, a bare type (same as Field(type)) or a nested
+    dict (a section). It is compiled once into one check function per field, so
+    an assignment only checks the assigned value: O(1) for scalars, O(size) for
+    lists and sections, and keys outside the schema just get the JSON check.
+    Missing keys with a default are filled in memory when the file is read; that
+    alone never writes the file.
+
+    Example:
+        schema = Schema({
+            "version": Field(int, default=1),
+            "hud": {
+                "enabled": Field(bool, default=True),
+                "scale": Field(float, default=1.0, min=0.5, max=4.0),
+                "color": Field(str, default="white", choices=["white", "red", "green"]),
+            },
+            "waypoints": Field(list, default=[], items={"name": str, "pos": Field(list, items=int)}),
+        })
+        config = Config("settings.json", schema=schema)
+        config.hud.scale = 10  # ConfigError: hud.scale: must be <= 4.0
+    """
+
+    def __init__(self, spec: Dict[str, Any]):
+        self._checks: dict[tuple, Callable[[Any], None]] = {}
+        self._sections: set[tuple] = set()
+        # Fields that hold dicts: paths below them are not checked
+        self._dict_fields: set[tuple] = set()
+        self._defaults: Dict[str, Any] = {}
+        self._compile(spec, (), self._defaults)
+
+    def _compile(self, spec: Dict[str, Any], path: tuple, defaults: Dict[str, Any]) -> None:
+        self._sections.add(path)
+        for key, item in spec.items():
+            sub = path + (key,)
+            if isinstance(item, dict):
+                defaults[key] = {}
+                self._compile(item, sub, defaults[key])
+                if not defaults[key]:
+                    del defaults[key]
+                continue
+            field = item if isinstance(item, Field) else Field(item)
+            self._checks[sub] = _compile_field(field, ".".join(sub))
+            types = field.type if isinstance(field.type, tuple) else (field.type,)
+            if any(issubclass(dict, t) for t in types):
+                self._dict_fields.add(sub)
+            if field.default is not _MISSING:
+                defaults[key] = field.default
+
+    def check(self, path: list[str] | tuple, value: Any) -> None:
+        """Raise ConfigError if value may not be stored at path."""
+        key = tuple(path)
+        check = self._checks.get(key)
+        if check is not None:
+            check(value)
+        elif key in self._sections:
+            if not isinstance(value, dict):
+                raise ConfigError(f"{'.'.join(key) or '<root>'}: expected a section (dict), "
+                                  f"got {type(value).__name__}")
+            for k, v in value.items():
+                self.check(key + (k,), v)
+        else:
+            for i in range(len(key) - 1, 0, -1):
+                if key[:i] in self._checks and key[:i] not in self._dict_fields:
+                    raise ConfigError(f"{'.'.join(key[:i])}: is a value, not a section")
+            if not _is_json_serializable(value):
+                raise ConfigError(f"{'.'.join(key)}: value is not JSON-serializable")
+
+    def fill_defaults(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Add the defaults of missing keys to data (in place) and return it."""
+        _fill_defaults(data, self._defaults)
+        return data
+
+
+def _fill_defaults(data: Dict[str, Any], defaults: Dict[str, Any]) -> None:
+    for key, default in defaults.items():
+        value = data.get(key, _MISSING)
+        if value is _MISSING:
+            data[key] = _deep_copy(default)
+        elif isinstance(default, dict) and isinstance(value, dict):
+            _fill_defaults(value, default)
+
+
+def _compile_field(field: Field, name: str) -> Callable[[Any], None]:
+    """Build the check function of a schema field."""
+    types = field.type if isinstance(field.type, tuple) else (field.type,)
+    if float in types and int not in types:
+        types += (int,)
+    allow_bool = any(issubclass(bool, t) and t is not int for t in types)
+    expected = " or ".join(t.__name__ for t in types)
+    nullable, lo, hi, choices = field.nullable, field.min, field.max, field.choices
+    containers = any(t in (list, dict, tuple) for t in types)
+    item_check = None
+    # Exact element types accepted without calling item_check per element
+    item_types: frozenset | None = None
+    if field.items is not None:
+        if isinstance(field.items, dict):
+            item_schema = Schema(field.items)
+
+            def item_check(item, index):
+                try:
+                    item_schema.check((), item)
+                except ConfigError as e:
+                    raise ConfigError(f"{name}[{index}].{e}") from None
+        else:
+            items = field.items if isinstance(field.items, Field) else Field(field.items)
+            check_one = _compile_field(items, name + "[]")
+
+            def item_check(item, index):
+                try:
+                    check_one(item)
+                except ConfigError as e:
+                    raise ConfigError(f"{name}[{index}]{str(e)[len(name) + 2:]}") from None
+
+            plain = (items.min is None and items.max is None and items.choices is None
+                     and items.items is None and not items.nullable)
+            if plain and isinstance(items.type, type) and items.type in _JSON_SCALARS:
+                item_types = frozenset({int, float} if items.type is float else {items.type})
+
+    def check(value: Any) -> None:
+        if value is None and nullable:
+            return
+        if not isinstance(value, types) or (value.__class__ is bool and not allow_bool):
+            raise ConfigError(f"{name}: expected {expected}, got {type(value).__name__}")
+        if lo is not None and value < lo:
+            raise ConfigError(f"{name}: must be >= {lo}")
+        if hi is not None and value > hi:
+            raise ConfigError(f"{name}: must be <= {hi}")
+        if choices is not None and value not in choices:
+            raise ConfigError(f"{name}: must be one of {list(choices)}")
+        if item_check is not None:
+            if item_types is not None and {type(item) for item in value} <= item_types:
+                return
+            for index, item in enumerate(value):
+                item_check(item, index)
+        elif containers and not _is_json_serializable(value):
+            raise ConfigError(f"{name}: value is not JSON-serializable")
+
+    return check
+
+
 class ConfigNode:
     """
     Wrapper that provides attribute-style access to a nested dictionary.
 
+    Nodes are cached: a node keeps a reference to its backing dict and to the
+    child nodes it handed out, so repeated reads like cfg.a.b.c neither walk the
+    path from the root nor allocate new nodes. The cached dict is revalidated
+    against the config's structure version, which is bumped whenever dicts may
+    have been added, replaced or removed (reload, deletes, new keys, dict values).
+
     Example:
         root = ConfigNode(config, [])
         root.section.sub = 123
         value = root.section.sub
     """
-    __slots__ = ("_config", "_path")
+    __slots__ = ("_config", "_path", "_dict", "_version", "_children")
 
     def __init__(self, config: "Config", path: list[str]):
         # _config: reference to top-level Config instance
         # _path: list of keys from root to this node
+        # _dict/_version: cached backing dict and the structure version it was resolved at
+        # _children: cached child nodes by name
         object.__setattr__(self, "_config", config)
         object.__setattr__(self, "_path", path)
+        object.__setattr__(self, "_dict", None)
+        object.__setattr__(self, "_version", -1)
+        object.__setattr__(self, "_children", None)
 
-    def _get_target(self):
-        """Return the container (dict) and final key for this node's path."""
-        d = self._config._data
-        if not self._path:
-            return d, None
-        for key in self._path[:-1]:
-            d = d.setdefault(key, {})
+    def _resolve(self) -> Any:
+        """
+        Return the dict backing this node, _MISSING if the path does not exist yet,
+        or _VALUE if a non-dict value sits on the path.
+        """
+        config = self._config
+        if self._version == config._struct_version:
+            return self._dict
+        d = config._data
+        for key in self._path:
+            d = d.get(key, _MISSING)
             if not isinstance(d, dict):
-                # If encountering non-dict while traversing, replace with dict
-                # to allow nested assignment.
-                d_parent = self._config._data
-                for k in self._path[: self._path.index(key)]:
-                    d_parent = d_parent[k]
-                d_parent[key] = {}
-                d = d_parent[key]
-        return d, self._path[-1]
+                break
+        if d is not _MISSING and not isinstance(d, dict):
+            d = _VALUE
+        object.__setattr__(self, "_dict", d)
+        object.__setattr__(self, "_version", config._struct_version)
+        return d
+
+    def _child(self, name: str) -> "ConfigNode":
+        """Return the (cached) node for a child key."""
+        children = self._children
+        if children is None:
+            children = {}
+            object.__setattr__(self, "_children", children)
+        node = children.get(name)
+        if node is None:
+            node = children[name] = ConfigNode(self._config, self._path + [name])
+        return node
 
     # Attribute access
     def __getattr__(self, name: str) -> Any:
         # called when name not found on instance; treat as key lookup
         if name.startswith("_"):
             raise AttributeError(name)
-        d = self._config._data
-        for key in self._path:
-            d = d.get(key, {})
-            if not isinstance(d, dict):
-                # If this intermediate path is not a dict, then no attributes available
-                break
-        if not isinstance(d, dict):
+        if self._config._lazy:
+            self._config._ensure(self._path + [name], subtree=False)
+        d = self._resolve()
+        if d is _VALUE:
             # d is a value -> attribute access not allowed
             raise AttributeError(f"'{name}' not found because path is a value")
-        if name not in d:
+        if d is _MISSING or name not in d:
             # return a node for further nested access (creates lazily)
-            return ConfigNode(self._config, self._path + [name])
+            return self._child(name)
         val = d[name]
         if isinstance(val, dict):
-            return ConfigNode(self._config, self._path + [name])
+            return self._child(name)
         return val
 
     def __setattr__(self, name: str, value: Any) -> None:
         if name.startswith("_"):
             object.__setattr__(self, name, value)
             return
-        if not _is_json_serializable(value):
-            raise ConfigError("Value is not JSON-serializable")
-        container, final_key = self._get_target()
-        # Ensure intermediate container is a dict
-        if final_key is not None:
-            # Move into nested dict
-            container = container.setdefault(final_key, {})
-            if not isinstance(container, dict):
-                # Overwrite non-dict with dict to store nested attribute
-                parent, fk = self._get_target_for_parent()
-                parent[fk] = {}
-                container = parent[fk]
-        container[name] = value
-        if self._config._autosave:
-            self._config.save()
+        config = self._config
+        config._validate(self._path, name, value)
+        with config._lock:
+            container = self._resolve()
+            if not isinstance(container, dict) or config._owned is not None:
+                # Path missing, blocked by a value or shared with a snapshot
+                container = config._writable(self._path, create=True)
+            old = container.get(name, _MISSING)
+            container[name] = value
+            config._record(self._path + [name], value)
+            if old is _MISSING or isinstance(old, dict) or isinstance(value, dict):
+                config._structure_changed()
+        config._changed()
 
     def __delattr__(self, name: str) -> None:
         if name.startswith("_"):
             raise AttributeError(name)
-        d = self._config._data
-        for key in self._path:
-            d = d.get(key, {})
-            if not isinstance(d, dict):
-                break
-        if not isinstance(d, dict) or name not in d:
-            raise AttributeError(name)
-        del d[name]
-        if self._config._autosave:
-            self._config.save()
+        config = self._config
+        with config._lock:
+            if config._lazy:
+                config._ensure(self._path + [name])
+            d = self._resolve()
+            if not isinstance(d, dict) or name not in d:
+                raise AttributeError(name)
+            if config._owned is not None:
+                d = config._writable(self._path)
+            del d[name]
+            config._record(self._path + [name], _MISSING)
+            config._structure_changed()
+        config._changed()
 
     def __getitem__(self, key: str) -> Any:
         # dictionary-style access: node['key']
@@ -122,40 +501,176 @@ class ConfigNode:
     def __setitem__(self, key: str, value: Any) -> None:
         setattr(self, key, value)
 
-    def _get_target_for_parent(self):
+    def batch(self) -> Iterator["ConfigNode"]:
         """
-        Helper: return (parent_dict, final_key) where parent_dict[final_key] is
-        the dict representing this node.
+        Group several updates under this node into a single save.
+
+        Same as Config.batch(), except that if an exception escapes the block only
+        this node's subtree is rolled back.
         """
-        if not self._path:
-            return self._config._data, None
-        d = self._config._data
-        for key in self._path[:-1]:
-            d = d.setdefault(key, {})
-            if not isinstance(d, dict):
-                # Fix non-dict intermediate
-                d_parent = self._config._data
-                for k in self._path[: self._path.index(key)]:
-                    d_parent = d_parent[k]
-                d_parent[key] = {}
-                d = d_parent[key]
-        return d, self._path[-1]
+        return self._config._batch(self._path, self)
 
     def to_dict(self) -> dict:
         """Return a plain dict view of this node."""
-        d = self._config._data
-        for key in self._path:
-            d = d.get(key, {})
+        if self._config._lazy:
+            self._config._ensure(self._path)
+        d = self._resolve()
+        if d is _MISSING:
+            return {}
+        if d is _VALUE:
+            d = self._config._get_path(self._path)
         # if d is not a dict, return it as-is wrapped in dict? better return value directly
         if isinstance(d, dict):
             # deep copy to prevent external mutation
-            return json.loads(json.dumps(d))
+            with self._config._lock:
+                return _deep_copy(d)
         return d
 
+    def snapshot(self) -> Any:
+        """
+        Return a read-only view of this node (see Config.snapshot()).
+
+        Returns an empty mapping if the node does not exist, or the value itself
+        if the path holds a non-dict value.
+        """
+        snap = self._config.snapshot()
+        for key in self._path:
+            if not isinstance(snap, FrozenMapping):
+                return snap
+            snap = snap.get(key, _EMPTY_FROZEN)
+        return snap
+
     def __repr__(self):
         return f"<ConfigNode path={'.'.join(self._path) if self._path else '<root>'}>"
 
 
+# Configs with deferred autosave, flushed at interpreter exit
+_deferred_configs: "weakref.WeakSet[Config]" = weakref.WeakSet()
+
+
+def _flush_all() -> None:
+    for config in list(_deferred_configs):
+        try:
+            config.close()
+        except Exception as e:
+            print(f"Error saving {config._path}: {e}", file=sys.stderr)
+
+
+atexit.register(_flush_all)
+
+
+class _Watcher:
+    """
+    One daemon thread that polls the files of every watched Config.
+
+    Each config has its own interval; the thread sleeps until the next one is
+    due, so idle configs cost a stat() per interval and nothing else. The thread
+    exits when no config is watched anymore.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition(threading.Lock())
+        # config -> [interval, next poll time]
+        self._configs: "weakref.WeakKeyDictionary[Config, list[float]]" = weakref.WeakKeyDictionary()
+        self._thread: threading.Thread | None = None
+
+    def add(self, config: "Config", interval: float) -> None:
+        with self._cond:
+            self._configs[config] = [interval, time.monotonic() + interval]
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="config-watcher", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+    def remove(self, config: "Config") -> None:
+        with self._cond:
+            self._configs.pop(config, None)
+            self._cond.notify()
+
+    def _run(self) -> None:
+        with self._cond:
+            while True:
+                # Configs may be garbage collected at any time: work on a copy
+                items = list(self._configs.items())
+                if not items:
+                    break
+                now = time.monotonic()
+                due = [config for config, entry in items if entry[1] <= now]
+                if not due:
+                    timeout = min(entry[1] for _, entry in items) - now
+                    del items
+                    self._cond.wait(timeout)
+                    continue
+                for config, entry in items:
+                    if entry[1] <= now:
+                        entry[1] = now + entry[0]
+                del items
+                self._cond.release()
+                try:
+                    for config in due:
+                        try:
+                            config._poll()
+                        except Exception as e:  # keep watching the other configs
+                            print(f"Error reloading {config._path}: {e}", file=sys.stderr)
+                finally:
+                    due = config = entry = None
+                    self._cond.acquire()
+            self._thread = None
+
+
+_watcher = _Watcher()
+
+
+class _FileLock:
+    """Advisory lock held on "<path>.lock" to serialize saves across processes."""
+
+    def __init__(self, path: str):
+        self._path = path
+        self._fd: int | None = None
+
+    def __enter__(self) -> "_FileLock":
+        try:
+            fd = os.open(self._path, os.O_RDWR | os.O_CREAT, 0o644)
+        except OSError as e:
+            raise ConfigError(f"Error saving config file: {e}") from e
+        try:
+            if os.name == "nt":
+                while True:
+                    try:
+                        msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+                        break
+                    except OSError:
+                        pass  # LK_LOCK gives up after ~10 s; keep waiting
+            else:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+        except BaseException as e:
+            os.close(fd)
+            if isinstance(e, OSError):
+                raise ConfigError(f"Error saving config file: {e}") from e
+            raise
+        self._fd = fd
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        fd, self._fd = self._fd, None
+        try:
+            if os.name == "nt":
+                os.lseek(fd, 0, os.SEEK_SET)
+                msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+        finally:
+            os.close(fd)
+
+
+# Seconds a watched file may stay unreadable (being written) before it is reported
+_BAD_READ_GRACE = 2.0
+
+# Instances handed out by Config.shared()
+_shared_configs: "weakref.WeakValueDictionary[tuple, Config]" = weakref.WeakValueDictionary()
+_shared_lock = threading.Lock()
+
+
 class Config:
     """
     JSON-backed configuration object.
@@ -166,21 +681,103 @@ class Config:
         config.database.port = 3306
         print(config.database.host)
         config.save()  # if autosave=False
+
+    Deferred autosave:
+        With save_delay set, assignments only mark the config dirty and a
+        background thread saves it once no change happened for save_delay
+        seconds (or max_save_interval seconds after the first unsaved change,
+        whichever comes first). flush() saves pending changes right away and
+        close() (also run at interpreter exit) flushes and stops the thread.
+
+        config = Config("state.json", save_delay=1.0, max_save_interval=5.0)
+        config.counter += 1   # no disk write here
+        config.flush()        # barrier: changes are on disk after this
+
+    asyncio:
+        save_delay=0 saves every change right away, but on the background
+        thread, so assignments never block the event loop. asave() and
+        areload() do the disk I/O of save() and reload() in a worker thread.
+
+        config = Config("settings.json", save_delay=0)
+        config.hud.x = 10           # returns immediately
+        await config.asave()        # explicit save without blocking the loop
+
+    Sharing:
+        Config.shared(path) returns one instance per file for the whole process.
+        With file_lock=True, saves from several processes (Minescript jobs) are
+        serialized by a lock file, and if another process saved since this one
+        last read the file, its data is read back and this instance's changes
+        are applied on top before writing, so neither side loses updates.
+
+        config = Config.shared("settings.json", file_lock=True)
     """
 
-    def __init__(self, path: str, autosave: bool = True):
+    def __init__(self, path: str, autosave: bool = True, save_delay: float | None = None,
+                 max_save_interval: float | None = None, file_lock: bool = False,
+                 schema: Schema | Dict[str, Any] | None = None):
         """
         Initialize the Config.
 
         :param path: path to JSON file
         :param autosave: if True, save to disk after every assignment
+        :param save_delay: if set (seconds), autosave is deferred to a background
+                           thread and coalesced until changes stop for this long
+        :param max_save_interval: with save_delay, upper bound (seconds) on how long
+                                  changes may stay unsaved while updates keep coming
+        :param file_lock: if True, guard saves with a "<path>.lock" file and merge
+                          changes saved meanwhile by other processes
+        :param schema: Schema (or spec dict) that assignments are checked against
+                       and whose defaults fill missing keys
         """
         self._path = os.fspath(path)
         self._autosave = bool(autosave)
         self._data: Dict[str, Any] = {}
+        # _lock guards _data against the background saver; _save_lock orders writes
+        self._lock = threading.RLock()
+        self._save_lock = threading.Lock()
+        self._save_delay = save_delay
+        self._max_save_interval = max_save_interval
+        self._cond = threading.Condition(threading.Lock())
+        self._dirty = False
+        self._dirty_since = 0.0
+        self._last_change = 0.0
+        self._saving = False
+        self._closed = False
+        self._save_error: Exception | None = None
+        self._saver: threading.Thread | None = None
+        self._batch_depth = 0
+        self._batch_pending = False
+        # Set when data was written while the outermost batch was open
+        self._batch_saved = False
+        # Changes made inside the outermost batch, validated when it ends
+        self._batch_ops: list[dict] = []
+        # Bumped whenever dicts in _data may have been added, replaced or removed
+        self._struct_version = 0
+        # Bumped on every change of the data (see revision)
+        self._revision = 0
+        # Copy-on-write state: ids of dicts created since the last snapshot (None
+        # when no snapshot is alive), the live snapshots, and the latest one by revision
+        self._owned: set[int] | None = None
+        self._live_snapshots: list[weakref.ref] = []
+        self._snapshot: tuple[int, weakref.ref] | None = None
+        # Hot reload: signature of the file as last read or written, change callbacks
+        self._file_sig: tuple[int, int, int] | None = None
+        self._listeners: list[tuple[Callable[[str, Any, Any], None], str | None]] = []
+        # Signature and time of a file that failed to load while watching
+        self._bad_read: tuple[Any, float] | None = None
+        # Cross-process saves: the lock, and the changes made since the last save
+        # (replayed over data read back from disk, also by the watcher)
+        self._file_lock = _FileLock(self._path + ".lock") if file_lock else None
+        self._ops: list[dict] = []
+        self._ops_limit = 1024
+        self._schema = Schema(schema) if isinstance(schema, dict) else schema
+        self._root = ConfigNode(self, [])
         self._load_or_create()
 
     # Internal loading/creating
+    # Subclasses that load data on demand set this and implement _ensure(path, subtree)
+    _lazy = False
+
     def _load_or_create(self) -> None:
         if not os.path.exists(self._path):
             # ensure parent dir exists
@@ -190,16 +787,294 @@ class Config:
             # create empty json file
             self._data = {}
             self.save()
+            self._with_defaults(self._data)
             return
+        try:
+            self._file_sig = self._disk_sig()
+        except OSError as e:
+            raise ConfigError(f"Error reading config file: {e}") from e
+        self._data = self._with_defaults(self._read_data())
+
+    def _read_data(self) -> Dict[str, Any]:
+        """Read the stored data from disk."""
         try:
             with open(self._path, "r", encoding="utf-8") as f:
-                self._data = json.load(f)
-            if not isinstance(self._data, dict):
-                raise ConfigError("Top-level JSON must be an object/dictionary")
+                data = json.load(f)
         except json.JSONDecodeError as e:
             raise ConfigError(f"Invalid JSON in config file: {e}") from e
         except OSError as e:
             raise ConfigError(f"Error reading config file: {e}") from e
+        if not isinstance(data, dict):
+            raise ConfigError("Top-level JSON must be an object/dictionary")
+        return data
+
+    def _disk_sig(self) -> Any:
+        """Signature of the files on disk, compared by the watcher (raises OSError)."""
+        return _stat_sig(os.stat(self._path))
+
+    # Change tracking / deferred autosave
+    def _structure_changed(self) -> None:
+        """Invalidate the backing dicts cached by ConfigNodes."""
+        self._struct_version += 1
+        self._revision += 1
+
+    def _writable(self, path: list[str], create: bool = False) -> dict | None:
+        """
+        Return the dict at path, ready to be mutated.
+
+        Dicts still shared with a live snapshot are copied on the way down
+        (copy-on-write), so the snapshot keeps seeing the old data. With create,
+        missing or non-dict entries on the path are replaced by new dicts;
+        otherwise None is returned for them.
+        """
+        owned = self._owned
+        if owned is not None:
+            self._live_snapshots = [ref for ref in self._live_snapshots if ref() is not None]
+            if not self._live_snapshots:
+                # All snapshots are gone: nothing is shared anymore
+                self._owned = owned = None
+        changed = False
+        d = self._data
+        if owned is not None and id(d) not in owned:
+            d = self._data = dict(d)
+            owned.add(id(d))
+            changed = True
+        for key in path:
+            child = d.get(key)
+            if not isinstance(child, dict):
+                if not create:
+                    d = None
+                    break
+                child = d[key] = {}
+                if owned is not None:
+                    owned.add(id(child))
+                changed = True
+            elif owned is not None and id(child) not in owned:
+                child = d[key] = dict(child)
+                owned.add(id(child))
+                changed = True
+            d = child
+        if changed:
+            self._structure_changed()
+        return d
+
+    def _record(self, path: list[str], value: Any) -> None:
+        """Called (under _lock) with the path and new value of every mutation; _MISSING for deletes."""
+        op = {"p": list(path)} if value is _MISSING else {"p": list(path), "v": value}
+        self._ops.append(op)
+        if self._batch_depth:
+            self._batch_ops.append(op)
+        if len(self._ops) > self._ops_limit:
+            # Long runs without a save (autosave=False): drop overwritten changes
+            self._ops = _coalesce_ops(self._ops)
+            self._ops_limit = max(1024, 2 * len(self._ops))
+
+    def _validate(self, parent: list[str] | tuple, name: str, value: Any) -> None:
+        """Check that a value assigned to parent.name can be stored (deferred inside batch())."""
+        if self._batch_depth:
+            return
+        if self._schema is not None:
+            self._schema.check((*parent, name), value)
+        elif not _is_json_serializable(value):
+            raise ConfigError("Value is not JSON-serializable")
+
+    def _check(self, path: list[str], value: Any) -> None:
+        """Check value for path against the schema (or only for JSON) after a batch."""
+        if self._schema is not None:
+            self._schema.check(path, value)
+        elif not _is_json_serializable(value):
+            raise ConfigError("Value is not JSON-serializable")
+
+    def _with_defaults(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Fill missing keys of freshly read data from the schema defaults."""
+        if self._schema is not None:
+            self._schema.fill_defaults(data)
+        return data
+
+    def _changed(self) -> None:
+        """Called after every mutation of _data."""
+        self._revision += 1
+        if self._batch_depth:
+            self._batch_pending = True
+            return
+        if not self._autosave:
+            return
+        if self._save_delay is None:
+            self.save()
+            return
+        with self._cond:
+            now = time.monotonic()
+            if not self._dirty:
+                self._dirty = True
+                self._dirty_since = now
+            self._last_change = now
+            if self._saver is None:
+                self._saver = threading.Thread(target=self._saver_loop, name=f"config-saver:{self._path}",
+                                               daemon=True)
+                self._saver.start()
+                _deferred_configs.add(self)
+            self._cond.notify()
+
+    def _saver_loop(self) -> None:
+        """Background thread: save once changes have settled."""
+        with self._cond:
+            while not self._closed:
+                if not self._dirty:
+                    self._cond.wait()
+                    continue
+                deadline = self._last_change + self._save_delay
+                if self._max_save_interval is not None:
+                    deadline = min(deadline, self._dirty_since + self._max_save_interval)
+                timeout = deadline - time.monotonic()
+                if timeout > 0:
+                    self._cond.wait(timeout)
+                    continue
+                if self._batch_depth:
+                    # Don't write half a batch; _wake_saver() runs when it ends
+                    self._cond.wait()
+                    continue
+                self._save_pending()
+
+    def _save_pending(self) -> None:
+        """Save dirty data; must be called with _cond held (it is released while writing)."""
+        self._dirty = False
+        self._saving = True
+        self._cond.release()
+        try:
+            self.save()
+        except Exception as e:
+            # Keep the thread alive; flush() re-raises the error
+            self._save_error = e
+        finally:
+            self._cond.acquire()
+            self._saving = False
+            self._cond.notify_all()
+
+    def _wake_saver(self) -> None:
+        """Called when the outermost batch ends, so the saver writes what it held back."""
+        if self._saver is not None:
+            with self._cond:
+                self._cond.notify_all()
+
+    def batch(self) -> Iterator["Config"]:
+        """
+        Group several updates into a single save.
+
+        Inside the block assignments are neither validated nor saved. When the
+        outermost batch exits, the values assigned in it are validated and, with
+        autosave, the data is written once. If an exception escapes the block (or
+        a value is not JSON-serializable), the in-memory state is rolled back to
+        what it was when the block started. Like for snapshot(), lists and dicts
+        mutated in place (not through the Config API) are not rolled back.
+
+        Example:
+            with cfg.batch():
+                cfg.bot.x = 10
+                cfg.bot.y = 64
+                cfg.bot.state = "mining"
+        """
+        return self._batch([], self)
+
+    @contextmanager
+    def _batch(self, path: list[str], target: Any) -> Iterator[Any]:
+        """Batch context shared by Config.batch() and ConfigNode.batch()."""
+        with self._lock:
+            # A copy-on-write snapshot keeps the data as it was for rollback,
+            # without copying it up front
+            frozen = self.snapshot()
+            snapshot = frozen._d
+            for key in path:
+                snapshot = snapshot.get(key, _MISSING) if isinstance(snapshot, dict) else _MISSING
+            if not self._batch_depth:
+                self._batch_saved = False
+                self._batch_ops = []
+            self._batch_depth += 1
+        try:
+            yield target
+            if self._batch_depth == 1 and self._batch_pending:
+                # Only what was assigned inside the batch needs checking
+                with self._lock:
+                    ops, self._batch_ops = _coalesce_ops(self._batch_ops), []
+                    for op in ops:
+                        value = self._get_path(op["p"])
+                        if value is not _MISSING:
+                            self._check(op["p"], value)
+        except BaseException:
+            with self._lock:
+                self._set_path(path, snapshot)
+            del frozen
+            self._batch_depth -= 1
+            if not self._batch_depth and self._batch_pending:
+                self._batch_pending = False
+                # Changes outside the rolled back node still need saving, and
+                # so does the rollback itself if the batch was partly written
+                if path or self._batch_saved:
+                    try:
+                        self._changed()
+                    except ConfigError:
+                        pass  # the original exception is more relevant
+            if not self._batch_depth:
+                self._wake_saver()
+            raise
+        self._batch_depth -= 1
+        if not self._batch_depth and self._batch_pending:
+            self._batch_pending = False
+            self._changed()
+        if not self._batch_depth:
+            self._wake_saver()
+
+    def _get_path(self, path: list[str]) -> Any:
+        """Return the value at path in _data, or _MISSING."""
+        d: Any = self._data
+        for key in path:
+            if not isinstance(d, dict) or key not in d:
+                return _MISSING
+            d = d[key]
+        return d
+
+    def _set_path(self, path: list[str], value: Any) -> None:
+        """Put value at path in _data (deleting it for _MISSING)."""
+        self._structure_changed()
+        self._record(path, value)
+        if not path:
+            self._data = value
+            return
+        d = self._writable(path[:-1], create=value is not _MISSING)
+        if d is None:
+            return
+        if value is _MISSING:
+            d.pop(path[-1], None)
+        else:
+            d[path[-1]] = value
+
+    def flush(self) -> None:
+        """
+        Write pending deferred changes to disk now and wait until they are saved.
+
+        Inside a batch() nothing is written: pending changes are saved when the
+        outermost batch ends. Raises the error of a failed background save, if any.
+        """
+        with self._cond:
+            while self._saving:
+                self._cond.wait()
+            if self._dirty and not self._batch_depth:
+                self._save_pending()
+            error, self._save_error = self._save_error, None
+        if error is not None:
+            raise error
+
+    def close(self) -> None:
+        """Flush pending changes and stop the background saver thread and watching."""
+        self.unwatch()
+        self.flush()
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if self._saver is not None and self._saver is not threading.current_thread():
+            self._saver.join()
+        self._saver = None
+        self._closed = False
+        _deferred_configs.discard(self)
 
     # Public API
     def save(self) -> None:
@@ -209,15 +1084,85 @@ class Config:
         Writing is done to a temporary file in the same directory and then
         os.replace() is used to move it into place.
         """
+        with self._save_lock:
+            if self._file_lock is None:
+                self._write_file()
+                return
+            with self._file_lock:
+                merged = self._merge_from_disk()
+                self._write_file()
+        if merged is not None:
+            self._notify(*merged)
+
+    @classmethod
+    def shared(cls, path: str, **kwargs: Any) -> "Config":
+        """
+        Return the process-wide instance for path, creating it on first use.
+
+        kwargs are passed to the constructor the first time only; later calls
+        get the existing instance whatever they pass. The instance is dropped
+        once nothing references it anymore.
+        """
+        key = (cls, os.path.realpath(path))
+        with _shared_lock:
+            config = _shared_configs.get(key)
+            if config is None:
+                config = _shared_configs[key] = cls(path, **kwargs)
+            return config
+
+    def _merge_from_disk(self) -> tuple[dict, dict] | None:
+        """
+        Read back the file if another process saved it since we last read or
+        wrote it, and reapply our unsaved changes on top. Called with the file
+        lock held; returns (old, new) data if it was merged.
+        """
+        try:
+            sig = self._disk_sig()
+        except FileNotFoundError:
+            sig = None
+        with self._lock:
+            if sig is None or sig == self._file_sig:
+                self._ops = []
+                return None
+            data = self._with_defaults(self._read_data())
+            for op in _coalesce_ops(self._ops):
+                data = _apply_op(data, op["p"], op.get("v", _MISSING))
+            self._ops = []
+            old, self._data = self._data, data
+            self._structure_changed()
+        return old, data
+
+    def _write_file(self) -> None:
+        """Write the whole data to the JSON file; must be called with _save_lock held."""
         dirpath = os.path.dirname(self._path) or "."
+        with self._lock:
+            # Serialize a copy-on-write snapshot so writers don't wait for json.dumps
+            snap = self.snapshot()
+            if self._batch_depth:
+                self._batch_saved = True
+            # The snapshot holds every recorded change
+            ops, self._ops = self._ops, []
+        try:
+            text = json.dumps(snap._d, ensure_ascii=False, indent=2)
+            del snap
+            self._replace_file(text, dirpath)
+        except BaseException:
+            # Not saved: the changes are still pending
+            with self._lock:
+                self._ops[:0] = ops
+            raise
+
+    def _replace_file(self, text: str, dirpath: str) -> None:
+        """Atomically replace the JSON file with text."""
         fd, tmp_path = tempfile.mkstemp(prefix=".tmp_config_", dir=dirpath)
         try:
             with os.fdopen(fd, "w", encoding="utf-8") as tmpf:
-                json.dump(self._data, tmpf, ensure_ascii=False, indent=2)
+                tmpf.write(text)
                 tmpf.flush()
                 os.fsync(tmpf.fileno())
             # atomic replace
             os.replace(tmp_path, self._path)
+            self._file_sig = self._disk_sig()
         except OSError as e:
             # try to clean up temp file
             try:
@@ -227,49 +1172,248 @@ class Config:
             raise ConfigError(f"Error saving config file: {e}") from e
 
     def reload(self) -> None:
-        """Reload data from disk, replacing in-memory state."""
+        """Reload data from disk, replacing in-memory state (change callbacks are fired)."""
+        self._ops = []
+        old = self._data
         self._load_or_create()
+        self._structure_changed()
+        self._notify(old, self._data)
+
+    async def asave(self) -> None:
+        """Like save(), but writing in a worker thread so the event loop keeps running."""
+        await asyncio.to_thread(self.save)
+
+    async def areload(self) -> None:
+        """
+        Like reload(), but reading in a worker thread; change callbacks run on the event loop.
+
+        Unsaved changes made before the call are dropped, like with reload();
+        assignments made while the file is being read are kept.
+        """
+        with self._lock:
+            self._ops = []
+        while True:
+            before, sig, data = await asyncio.to_thread(self._read_fresh)
+            with self._lock:
+                if self._file_sig != before:
+                    continue  # saved or reloaded meanwhile: read it again
+                missing = data is None
+                if missing:
+                    data = self._with_defaults({})
+                # Keep changes made while reading
+                for op in self._ops:
+                    data = _apply_op(data, op["p"], op.get("v", _MISSING))
+                old = self._data
+                self._data = data
+                self._file_sig = sig
+                self._structure_changed()
+            break
+        if missing:
+            await self.asave()
+        self._notify(old, data)
+
+    def _read_fresh(self) -> tuple[Any, Any, Dict[str, Any] | None]:
+        """
+        Read the file for areload() (in a worker thread). Returns the file
+        signature known before reading, the new one and the data (None for
+        both if the file doesn't exist).
+        """
+        with self._save_lock:
+            before = self._file_sig
+            if not os.path.exists(self._path):
+                return before, None, None
+            try:
+                sig = self._disk_sig()
+            except OSError as e:
+                raise ConfigError(f"Error reading config file: {e}") from e
+            return before, sig, self._with_defaults(self._read_data())
+
+    def watch(self, interval: float = 1.0) -> None:
+        """
+        Reload automatically when the file is changed by someone else.
+
+        The file is stat()ed every interval seconds and only re-read when its
+        mtime, size or inode changed, then callbacks registered with on_change()
+        are fired for every changed key. All watched configs share one background
+        thread. Pending deferred saves take precedence: the file is not reloaded
+        while they wait to be written. Other unsaved changes (autosave=False, or
+        an assignment made while the file was being read) are applied again on
+        top of the reloaded data, so they are kept; only changes made by mutating
+        a stored list or dict in place are not tracked and get replaced.
+
+        Example:
+            cfg = Config("settings.json")
+            cfg.on_change(lambda path, old, new: print(path, old, "->", new), "hud")
+            cfg.watch(0.5)
+        """
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+        _watcher.add(self, interval)
+
+    def unwatch(self) -> None:
+        """Stop watching the file for changes."""
+        _watcher.remove(self)
+
+    def on_change(self, callback: Callable[[str, Any, Any], None], key: str | None = None) -> None:
+        """
+        Register callback(path, old, new) for changes found on reload.
+
+        path is the dotted key path of a changed value ("hud.color"); old or new
+        is None when the key was added or removed. With key (a dotted path), the
+        callback only gets changes at, under or above that path. Callbacks run
+        on the thread that reloaded (the watcher thread for watch()).
+        """
+        self._listeners.append((callback, key))
+
+    def _poll(self) -> None:
+        """Reload the file if it changed on disk since it was last read or written."""
+        try:
+            sig = self._disk_sig()
+        except OSError:
+            return
+        if sig == self._file_sig or self._batch_depth:
+            return
+        with self._cond:
+            if self._dirty or self._saving:
+                return
+        if not self._save_lock.acquire(blocking=False):
+            return  # a save is in progress, the file is ours
+        try:
+            try:
+                data = self._with_defaults(self._read_data())
+            except ConfigError as e:
+                # Usually a plain (non-atomic) write caught halfway, maybe before
+                # the signature changed: retry on the next polls, and only report
+                # content that stays unreadable
+                now = time.monotonic()
+                if self._bad_read is None or self._bad_read[0] != sig:
+                    self._bad_read = (sig, now)
+                elif now - self._bad_read[1] >= _BAD_READ_GRACE:
+                    # Don't retry until the file changes again
+                    self._file_sig = sig
+                    self._bad_read = None
+                    print(f"Error reloading {self._path}: {e}", file=sys.stderr)
+                return
+            self._bad_read = None
+            with self._lock:
+                # Keep changes not saved yet, including ones made while reading
+                for op in self._ops:
+                    data = _apply_op(data, op["p"], op.get("v", _MISSING))
+                old = self._data
+                self._data = data
+                self._file_sig = sig
+                self._structure_changed()
+        finally:
+            self._save_lock.release()
+        self._notify(old, data)
+
+    def _notify(self, old: dict, new: dict) -> None:
+        """Fire change callbacks for the differences between old and new data."""
+        if not self._listeners:
+            return
+        changes: list = []
+        _diff(old, new, "", changes)
+        for path, a, b in changes:
+            for callback, key in list(self._listeners):
+                if key is not None and not (path == key or path.startswith(key + ".")
+                                            or key.startswith(path + ".")):
+                    continue
+                try:
+                    callback(path, a, b)
+                except Exception as e:
+                    print(f"Error in config change callback: {e}", file=sys.stderr)
 
     def to_dict(self) -> Dict[str, Any]:
         """Return a deep copy of the internal data as a plain dict."""
-        # Use JSON roundtrip to get a deep copy with only JSON-serializable content
-        return json.loads(json.dumps(self._data))
+        with self._lock:
+            if self._lazy:
+                self._ensure([])
+            return _deep_copy(self._data)
+
+    def snapshot(self) -> FrozenMapping:
+        """
+        Return a read-only view of the current data.
+
+        The snapshot shares the live dicts instead of copying them; changes made
+        through the Config API afterwards copy only the dicts on the changed path
+        (copy-on-write), so the snapshot never sees them. Calling snapshot() again
+        without changes in between returns the same object. For per-frame
+        rendering, prefer this (or checking revision) over to_dict().
+
+        Note: lists and dicts that were assigned as values are shared as-is, so
+        mutating them in place (not through the Config API) shows in snapshots.
+        """
+        with self._lock:
+            if self._lazy:
+                self._ensure([])
+            if self._snapshot is not None:
+                revision, ref = self._snapshot
+                snap = ref()
+                if snap is not None and revision == self._revision:
+                    return snap
+            snap = FrozenMapping(self._data)
+            self._owned = set()
+            ref = weakref.ref(snap)
+            self._live_snapshots = [r for r in self._live_snapshots if r() is not None]
+            self._live_snapshots.append(ref)
+            self._snapshot = (self._revision, ref)
+            return snap
+
+    @property
+    def revision(self) -> int:
+        """Counter bumped on every change of the data; compare it to skip re-reading unchanged config."""
+        return self._revision
 
     # Attribute access returns a ConfigNode rooted at given path
     def __getattr__(self, name: str) -> Any:
         if name.startswith("_"):
             raise AttributeError(name)
+        if self._lazy:
+            self._ensure([name], subtree=False)
         # If the key exists and is not a dict, return its value
-        if name in self._data and not isinstance(self._data[name], dict):
-            return self._data[name]
+        val = self._data.get(name, _MISSING)
+        if val is not _MISSING and not isinstance(val, dict):
+            return val
         # Otherwise return a node for nested access
-        return ConfigNode(self, [name])
+        return self._root._child(name)
 
     def __setattr__(self, name: str, value: Any) -> None:
         # Internal attrs start with underscore, set normally
         if name.startswith("_"):
             object.__setattr__(self, name, value)
             return
-        if not _is_json_serializable(value):
-            raise ConfigError("Value is not JSON-serializable")
-        self._data[name] = value
-        if self._autosave:
-            self.save()
+        self._validate((), name, value)
+        with self._lock:
+            data = self._data if self._owned is None else self._writable([])
+            old = data.get(name, _MISSING)
+            data[name] = value
+            self._record([name], value)
+            if old is _MISSING or isinstance(old, dict) or isinstance(value, dict):
+                self._structure_changed()
+        self._changed()
 
     def __delattr__(self, name: str) -> None:
         if name.startswith("_"):
             raise AttributeError(name)
+        if self._lazy:
+            self._ensure([name])
         if name not in self._data:
             raise AttributeError(name)
-        del self._data[name]
-        if self._autosave:
-            self.save()
+        with self._lock:
+            data = self._data if self._owned is None else self._writable([])
+            del data[name]
+            self._record([name], _MISSING)
+            self._structure_changed()
+        self._changed()
 
     # dict-style access as well
     def __getitem__(self, key: str) -> Any:
-        if key in self._data and not isinstance(self._data[key], dict):
-            return self._data[key]
-        return ConfigNode(self, [key])
+        if self._lazy:
+            self._ensure([key], subtree=False)
+        val = self._data.get(key, _MISSING)
+        if val is not _MISSING and not isinstance(val, dict):
+            return val
+        return self._root._child(key)
 
     def __setitem__(self, key: str, value: Any) -> None:
         setattr(self, key, value)
@@ -282,6 +1426,425 @@ class Config:
         # on normal exit, ensure saved if autosave disabled
         if not self._autosave:
             self.save()
+        elif self._save_delay is not None:
+            self.close()
 
     def __repr__(self):
+        if self._autosave and self._save_delay is not None:
+            return f"<Config path={self._path!r} autosave={self._autosave} save_delay={self._save_delay}>"
         return f"<Config path={self._path!r} autosave={self._autosave}>"
+
+
+class JournalConfig(Config):
+    """
+    Config that saves changes by appending them to a journal file.
+
+    Instead of rewriting the whole JSON file, save() appends one JSON line per
+    change ({"p": [path...], "v": value}, or just {"p": [...]} for a delete) to
+    "<path>.journal", so writing costs as much as the change, not the config.
+    When the journal grows past compact_size bytes it is folded into the main
+    JSON file and truncated. Loading reads the JSON file and replays the journal;
+    a torn last line (crash while appending) is ignored and overwritten by the
+    next save.
+
+    Meant for counters and state that change many times per second, ideally
+    together with save_delay. The main file stays a normal config file, but it
+    is only up to date after compact().
+
+    Note: only changes made through the Config API are journaled; after
+    mutating a stored list or dict in place, call compact().
+
+    Example:
+        state = JournalConfig("state.json", save_delay=0.5)
+        state.kills += 1
+    """
+
+    def __init__(self, path: str, autosave: bool = True, save_delay: float | None = None,
+                 max_save_interval: float | None = None, compact_size: int = 1 << 20,
+                 schema: Schema | Dict[str, Any] | None = None):
+        """
+        Initialize the JournalConfig.
+
+        :param compact_size: journal size (bytes) above which save() compacts it
+                             into the main JSON file
+        Other parameters are the same as Config.
+        """
+        self._journal_path = os.fspath(path) + ".journal"
+        self._compact_size = compact_size
+        self._journal_size = 0
+        super().__init__(path, autosave, save_delay, max_save_interval, schema=schema)
+
+    def _read_data(self) -> Dict[str, Any]:
+        data = super()._read_data()
+        try:
+            with open(self._journal_path, "rb") as f:
+                lines = f.read()
+        except FileNotFoundError:
+            self._journal_size = 0
+            return data
+        except OSError as e:
+            raise ConfigError(f"Error reading config journal: {e}") from e
+        pos = 0
+        while True:
+            end = lines.find(b"\n", pos)
+            if end < 0:
+                break  # complete lines end with a newline: the rest is a torn write
+            try:
+                op = json.loads(lines[pos:end])
+            except ValueError:
+                break  # torn write at the end
+            data = _apply_op(data, op["p"], op.get("v", _MISSING))
+            pos = end + 1
+        # Only the valid part counts: save() writes over a torn last line
+        self._journal_size = pos
+        return data
+
+    def _disk_sig(self) -> Any:
+        try:
+            journal = _stat_sig(os.stat(self._journal_path))
+        except FileNotFoundError:
+            journal = None
+        return (_stat_sig(os.stat(self._path)), journal)
+
+    def save(self) -> None:
+        """Append pending changes to the journal (compacting it when it gets too big)."""
+        with self._save_lock:
+            with self._lock:
+                ops, self._ops = _coalesce_ops(self._ops), []
+                if self._batch_depth:
+                    self._batch_saved = True
+            try:
+                self._append(ops)
+            except BaseException:
+                # Not saved: the changes are still pending
+                with self._lock:
+                    self._ops[:0] = ops
+                raise
+
+    def _append(self, ops: list[dict]) -> None:
+        """Write ops to the journal, or compact it; must be called with _save_lock held."""
+        text = "".join(json.dumps(op, ensure_ascii=False, separators=(",", ":")) + "\n" for op in ops)
+        if not os.path.exists(self._path) or self._journal_size + len(text) > self._compact_size:
+            self._compact()
+            return
+        if not ops:
+            return
+        raw = text.encode("utf-8")
+        try:
+            fd = os.open(self._journal_path, os.O_WRONLY | os.O_CREAT | getattr(os, "O_BINARY", 0), 0o666)
+            with os.fdopen(fd, "wb") as f:
+                # Append after the last valid line, dropping a torn one
+                f.seek(min(self._journal_size, os.fstat(f.fileno()).st_size))
+                f.write(raw)
+                f.truncate()
+                f.flush()
+                os.fsync(f.fileno())
+            self._journal_size += len(raw)
+            self._file_sig = self._disk_sig()
+        except OSError as e:
+            raise ConfigError(f"Error saving config journal: {e}") from e
+
+    def compact(self) -> None:
+        """Write the whole data to the main JSON file and empty the journal."""
+        with self._save_lock:
+            with self._lock:
+                self._ops = []
+            self._compact()
+
+    def _compact(self) -> None:
+        # The JSON file is replaced first: if we crash before the journal is
+        # truncated, replaying it over the new file gives the same data
+        self._write_file()
+        try:
+            if self._journal_size or os.path.exists(self._journal_path):
+                with open(self._journal_path, "wb"):
+                    pass
+            self._journal_size = 0
+            self._file_sig = self._disk_sig()
+        except OSError as e:
+            raise ConfigError(f"Error truncating config journal: {e}") from e
+
+    def __repr__(self):
+        return f"<JournalConfig path={self._path!r} autosave={self._autosave}>"
+
+
+_SEP = "\x1f"  # joins the keys of a path in SQLiteConfig rows
+_SEP_END = chr(ord(_SEP) + 1)  # rows under prefix P sort between P + _SEP and P + _SEP_END
+
+
+class SQLiteConfig(Config):
+    """
+    Config stored in a SQLite database, one row per key path.
+
+    Every non-dict value is a row (path, JSON value); dicts only exist through
+    the paths below them (empty dicts get a "{}" row). Nothing is read up front:
+    the rows under a key are loaded the first time it is accessed, so a script
+    touching cfg.chests.home only reads that chest. Saves write just the changed
+    rows, all changes of a save (or a batch()) in one transaction.
+
+    The database uses WAL mode, so several Minescript jobs can read and write
+    the same file; changes to different keys never overwrite each other. Values
+    another job changed are picked up after reload(), or automatically with
+    watch(). to_dict() and snapshot() load the whole database.
+
+    Example:
+        db = SQLiteConfig("state.db")
+        db.waypoints.home = [100, 64, -20]
+        with db.batch():
+            db.trades.villager1 = {"emeralds": 12}
+            db.trades.count += 1
+    """
+    _lazy = True
+
+    def __init__(self, path: str, autosave: bool = True, save_delay: float | None = None,
+                 max_save_interval: float | None = None, timeout: float = 5.0,
+                 schema: Schema | Dict[str, Any] | None = None):
+        """
+        Initialize the SQLiteConfig.
+
+        :param timeout: seconds to wait for another job holding the database lock
+        :param schema: checks assignments like for Config; defaults are not
+                       filled in, since nothing is read up front
+        Other parameters are the same as Config.
+        """
+        parent = os.path.dirname(os.fspath(path))
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+        try:
+            # Transactions are managed explicitly; _lock serializes use across threads
+            self._db = sqlite3.connect(os.fspath(path), timeout=timeout, isolation_level=None,
+                                       check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("CREATE TABLE IF NOT EXISTS config "
+                             "(path TEXT PRIMARY KEY, value TEXT NOT NULL) WITHOUT ROWID")
+        except sqlite3.Error as e:
+            raise ConfigError(f"Error opening config database: {e}") from e
+        # Unsaved changes are in _ops; _ops_base counts the ones already saved and
+        # _batch_mark is the absolute index where the outermost batch started
+        self._ops_base = 0
+        self._batch_mark = 0
+        # Paths whose whole subtree is in _data, and all their ancestors
+        self._loaded: set[tuple] = set()
+        self._loaded_prefixes: set[tuple] = set()
+        # Paths whose own row (and their ancestors' rows) was read
+        self._probed: set[tuple] = set()
+        super().__init__(path, autosave, save_delay, max_save_interval, schema=schema)
+
+    # Loading
+    def _load_or_create(self) -> None:
+        with self._lock:
+            self._data = {}
+            self._loaded = set()
+            self._loaded_prefixes = set()
+            self._probed = set()
+            self._ops = []
+            self._file_sig = self._disk_sig()
+
+    def _disk_sig(self) -> Any:
+        # Changes when another connection commits
+        with self._lock:
+            return self._db.execute("PRAGMA data_version").fetchone()[0]
+
+    def _is_loaded(self, key: tuple) -> bool:
+        loaded = self._loaded
+        return any(key[:i] in loaded for i in range(len(key) + 1))
+
+    def _mark_loaded(self, key: tuple) -> None:
+        self._loaded.add(key)
+        self._loaded_prefixes.update(key[:i] for i in range(len(key)))
+
+    def _ensure(self, path: list[str], subtree: bool = True) -> None:
+        """
+        Load what is stored at path: the rows at and under it with subtree, or
+        only the row of path itself (enough to tell a value from a dict) without.
+        Values sitting on the ancestors of path are loaded either way.
+        """
+        key = tuple(path)
+        if (not subtree and key in self._probed) or self._is_loaded(key):
+            return
+        with self._lock:
+            if (not subtree and key in self._probed) or self._is_loaded(key):
+                return
+            try:
+                if not key:
+                    rows = self._db.execute("SELECT path, value FROM config").fetchall()
+                else:
+                    prefixes = [_SEP.join(key[:i]) for i in range(1, len(key) + 1)]
+                    sql = f"SELECT path, value FROM config WHERE path IN ({','.join('?' * len(prefixes))})"
+                    if subtree:
+                        sql += " OR (path > ? AND path < ?)"
+                        prefixes += [prefixes[-1] + _SEP, prefixes[-1] + _SEP_END]
+                    rows = self._db.execute(sql, prefixes).fetchall()
+            except sqlite3.Error as e:
+                raise ConfigError(f"Error reading config database: {e}") from e
+            if rows:
+                self._merge(rows)
+            if subtree:
+                self._mark_loaded(key)
+            else:
+                self._probed.add(key)
+
+    def _merge(self, rows: list[tuple[str, str]]) -> None:
+        """Put database rows into _data, skipping paths overridden by unsaved changes."""
+        for path, text in rows:
+            keys = tuple(path.split(_SEP))
+            if keys in self._loaded_prefixes or self._is_loaded(keys):
+                continue
+            value = json.loads(text)
+            d = self._data
+            for key in keys[:-1]:
+                child = d.get(key)
+                if not isinstance(child, dict):
+                    child = d[key] = {}
+                d = child
+            if not (value == {} and isinstance(d.get(keys[-1]), dict)):
+                d[keys[-1]] = value
+        self._struct_version += 1
+
+    def _invalidate(self) -> None:
+        """Drop the cache and rebuild it from the unsaved changes."""
+        self._data = {}
+        self._loaded = set()
+        self._loaded_prefixes = set()
+        self._probed = set()
+        for op in self._ops:
+            self._data = _apply_op(self._data, op["p"], op.get("v", _MISSING))
+            self._mark_loaded(tuple(op["p"]))
+        self._structure_changed()
+
+    # Changes
+    def _record(self, path: list[str], value: Any) -> None:
+        if value is _MISSING:
+            self._ops.append({"p": list(path)})
+        else:
+            self._ops.append({"p": list(path), "v": value})
+        self._mark_loaded(tuple(path))
+
+    @contextmanager
+    def _batch(self, path: list[str], target: Any) -> Iterator[Any]:
+        """Batch context; changes are rolled back by dropping them and reloading lazily."""
+        with self._lock:
+            mark = self._ops_base + len(self._ops)
+            if not self._batch_depth:
+                self._batch_mark = mark
+            self._batch_depth += 1
+        try:
+            yield target
+            with self._lock:
+                for op in self._ops[mark - self._ops_base:]:
+                    if "v" in op:
+                        self._check(op["p"], op["v"])
+        except BaseException:
+            with self._lock:
+                start = mark - self._ops_base
+                # A node batch only discards changes inside the node
+                self._ops[start:] = [op for op in self._ops[start:] if op["p"][:len(path)] != path]
+                self._invalidate()
+            self._batch_depth -= 1
+            if not self._batch_depth and self._batch_pending:
+                self._batch_pending = False
+                if path:
+                    try:
+                        self._changed()
+                    except ConfigError:
+                        pass  # the original exception is more relevant
+            if not self._batch_depth:
+                self._wake_saver()
+            raise
+        self._batch_depth -= 1
+        if not self._batch_depth and self._batch_pending:
+            self._batch_pending = False
+            self._changed()
+        if not self._batch_depth:
+            self._wake_saver()
+
+    def save(self) -> None:
+        """Write unsaved changes to the database in one transaction."""
+        with self._save_lock, self._lock:
+            # Changes of a running batch are saved when it ends
+            count = self._batch_mark - self._ops_base if self._batch_depth else len(self._ops)
+            if count <= 0:
+                return
+            ops = _coalesce_ops(self._ops[:count])
+            db = self._db
+            try:
+                db.execute("BEGIN IMMEDIATE")
+                try:
+                    for op in ops:
+                        self._save_op(op["p"], op.get("v", _MISSING))
+                    db.execute("COMMIT")
+                except BaseException:
+                    db.execute("ROLLBACK")
+                    raise
+                self._file_sig = self._disk_sig()
+            except sqlite3.Error as e:
+                raise ConfigError(f"Error saving config database: {e}") from e
+            except (TypeError, ValueError) as e:
+                raise ConfigError(f"Value is not JSON-serializable: {e}") from e
+            del self._ops[:count]
+            self._ops_base += count
+
+    def _save_op(self, path: list[str], value: Any) -> None:
+        """Apply one change to the database (inside a transaction)."""
+        db = self._db
+        if path:
+            prefix = _SEP.join(path)
+            db.execute("DELETE FROM config WHERE path = ? OR (path > ? AND path < ?)",
+                       (prefix, prefix + _SEP, prefix + _SEP_END))
+        else:
+            prefix = ""
+            db.execute("DELETE FROM config")
+        if value is _MISSING:
+            if len(path) > 1:
+                # Keep the parent dict alive if this was its last key
+                parent = _SEP.join(path[:-1])
+                if db.execute("SELECT 1 FROM config WHERE path > ? AND path < ? LIMIT 1",
+                              (parent + _SEP, parent + _SEP_END)).fetchone() is None:
+                    db.execute("INSERT OR REPLACE INTO config VALUES (?, '{}')", (parent,))
+            return
+        # Values on the ancestors are replaced by dicts
+        for i in range(1, len(path)):
+            db.execute("DELETE FROM config WHERE path = ?", (_SEP.join(path[:i]),))
+        rows: list[tuple[str, str]] = []
+        if path:
+            _flatten(prefix, value, rows)
+        else:
+            for key, child in value.items():
+                _flatten(key, child, rows)
+        db.executemany("INSERT OR REPLACE INTO config VALUES (?, ?)", rows)
+
+    # Reloading
+    def reload(self) -> None:
+        """Drop cached values and unsaved changes; values are read again on access."""
+        with self._lock:
+            self._load_or_create()
+            self._structure_changed()
+
+    async def areload(self) -> None:
+        """Same as reload(): nothing is read up front, so there is no disk I/O to move off the loop."""
+        self.reload()
+
+    def _poll(self) -> None:
+        """Drop cached values when another job committed changes."""
+        with self._lock:
+            sig = self._disk_sig()
+            if sig == self._file_sig:
+                return
+            self._file_sig = sig
+            self._invalidate()
+
+    def on_change(self, callback: Callable[[str, Any, Any], None], key: str | None = None) -> None:
+        """Not supported: values are loaded on demand, so there is nothing to diff."""
+        raise ConfigError("SQLiteConfig does not support change callbacks")
+
+    def __repr__(self):
+        return f"<SQLiteConfig path={self._path!r} autosave={self._autosave}>"
+
+
+def _flatten(path: str, value: Any, rows: list[tuple[str, str]]) -> None:
+    """Append the (path, JSON) rows storing value at path."""
+    if isinstance(value, dict) and value:
+        for key, child in value.items():
+            _flatten(path + _SEP + key, child, rows)
+    else:
+        rows.append((path, json.dumps(value, ensure_ascii=False)))
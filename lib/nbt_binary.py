@@ -0,0 +1,356 @@
+"""
+    @author RazrCraft
+    @create date 2026-10-17 12:03:18
+    @modify date 2026-10-17 21:12:40
+    @desc Minecraft binary NBT (Named Binary Tag) reader and writer.
+
+    Writing is not type-preserving: Python has no byte/short/float types, so
+    loading a file and saving it back turns Byte, Short and Float tags into Int
+    and Double (see dumps_nbt). The result is not byte-identical to the input
+    and the game may reject fields it expects with a narrower type.
+ """
+import gzip
+import io
+import mmap
+import os
+import re
+import struct
+import sys
+import zlib
+from array import array
+from typing import Any, Literal
+
+
+# Tag ids
+TAG_END = 0
+TAG_BYTE = 1
+TAG_SHORT = 2
+TAG_INT = 3
+TAG_LONG = 4
+TAG_FLOAT = 5
+TAG_DOUBLE = 6
+TAG_BYTE_ARRAY = 7
+TAG_STRING = 8
+TAG_LIST = 9
+TAG_COMPOUND = 10
+TAG_INT_ARRAY = 11
+TAG_LONG_ARRAY = 12
+
+_BYTE = struct.Struct(">b")
+_SHORT = struct.Struct(">h")
+_USHORT = struct.Struct(">H")
+_INT = struct.Struct(">i")
+_LONG = struct.Struct(">q")
+_FLOAT = struct.Struct(">f")
+_DOUBLE = struct.Struct(">d")
+
+_SCALARS = {
+    TAG_BYTE: _BYTE,
+    TAG_SHORT: _SHORT,
+    TAG_INT: _INT,
+    TAG_LONG: _LONG,
+    TAG_FLOAT: _FLOAT,
+    TAG_DOUBLE: _DOUBLE,
+}
+
+# Array tags and their array.array typecodes (same as snbt_parser)
+_ARRAYS = {TAG_BYTE_ARRAY: 'b', TAG_INT_ARRAY: 'i', TAG_LONG_ARRAY: 'q'}
+_ARRAY_TAGS = {'b': TAG_BYTE_ARRAY, 'i': TAG_INT_ARRAY, 'q': TAG_LONG_ARRAY}
+
+_SWAP = sys.byteorder == "little"
+
+# Characters outside the BMP, written by Java as a surrogate pair
+_SUPPLEMENTARY = re.compile("[\U00010000-\U0010FFFF]")
+
+Compression = Literal["gzip", "zlib", "none", "auto"]
+
+
+class NBTError(ValueError):
+    """Raised when binary NBT data is malformed or a value cannot be encoded."""
+
+
+# # # READING # # #
+
+class _Reader:
+    """Decodes tags from a bytes-like buffer (bytes, memoryview or mmap)."""
+    __slots__ = ("buf", "pos")
+
+    def __init__(self, buf):
+        self.buf = buf
+        self.pos = 0
+
+    def _unpack(self, st: struct.Struct):
+        value = st.unpack_from(self.buf, self.pos)[0]
+        self.pos += st.size
+        return value
+
+    def _string(self) -> str:
+        length = self._unpack(_USHORT)
+        start = self.pos
+        self.pos += length
+        raw = bytes(self.buf[start:self.pos])
+        try:
+            return raw.decode("utf-8")
+        except UnicodeDecodeError:
+            # Java writes "modified UTF-8" (surrogate pairs, encoded NUL)
+            raw = raw.replace(b"\xc0\x80", b"\x00")
+            return raw.decode("utf-8", "surrogatepass").encode("utf-16", "surrogatepass").decode("utf-16")
+
+    def _array(self, typecode: str) -> array:
+        count = self._unpack(_INT)
+        values = array(typecode)
+        size = count * values.itemsize
+        values.frombytes(self.buf[self.pos:self.pos + size])
+        self.pos += size
+        if _SWAP and values.itemsize > 1:
+            values.byteswap()
+        return values
+
+    def payload(self, tag: int) -> Any:
+        """Read the payload of a tag of the given id."""
+        st = _SCALARS.get(tag)
+        if st is not None:
+            return self._unpack(st)
+        if tag == TAG_STRING:
+            return self._string()
+        if tag == TAG_COMPOUND:
+            result = {}
+            while True:
+                child = self._unpack(_BYTE)
+                if child == TAG_END:
+                    return result
+                key = self._string()
+                result[key] = self.payload(child)
+        if tag == TAG_LIST:
+            child = self._unpack(_BYTE)
+            count = self._unpack(_INT)
+            st = _SCALARS.get(child)
+            if st is not None:
+                # Fixed-size items: unpack the whole run at once
+                fmt = f">{count}{st.format[-1]}"
+                values = list(struct.unpack_from(fmt, self.buf, self.pos))
+                self.pos += count * st.size
+                return values
+            return [self.payload(child) for _ in range(count)]
+        typecode = _ARRAYS.get(tag)
+        if typecode is not None:
+            return self._array(typecode)
+        raise NBTError(f"Unknown tag id {tag} at offset {self.pos - 1}")
+
+    def root(self) -> tuple[str, Any]:
+        """Read a named root tag."""
+        tag = self._unpack(_BYTE)
+        if tag == TAG_END:
+            return "", None
+        name = self._string()
+        return name, self.payload(tag)
+
+
+def _decompress(data, compression: Compression):
+    """Return data decompressed according to compression ("auto" sniffs the header)."""
+    if compression == "auto":
+        head = bytes(data[:2])
+        if head == b"\x1f\x8b":
+            compression = "gzip"
+        elif len(head) == 2 and head[0] == 0x78 and (head[0] << 8 | head[1]) % 31 == 0:
+            compression = "zlib"
+        else:
+            compression = "none"
+    if compression == "gzip":
+        return gzip.decompress(data)
+    if compression == "zlib":
+        return zlib.decompress(data)
+    if compression == "none":
+        return data
+    raise ValueError(f"Unknown compression: {compression!r}")
+
+
+def loads_nbt(data: bytes, compression: Compression = "auto", with_name: bool = False) -> Any:
+    """
+    Decode binary NBT data into Python objects.
+
+    Compounds become dicts, lists become lists, numbers become int/float, strings
+    become str, and byte/int/long arrays become array.array('b'/'i'/'q'), the
+    same object model as snbt_parser.parse_snbt.
+
+    Args:
+        data: Raw bytes (or any bytes-like buffer)
+        compression: "gzip", "zlib", "none" or "auto" to detect it from the header
+        with_name: If True, return (root_name, value) instead of just the value
+
+    Returns:
+        Any: The root tag value (usually a dict)
+
+    Raises:
+        NBTError: If the data is truncated or malformed
+    """
+    reader = _Reader(_decompress(data, compression))
+    try:
+        name, value = reader.root()
+    except (struct.error, IndexError) as e:
+        raise NBTError(f"Truncated NBT data: {e}") from e
+    return (name, value) if with_name else value
+
+
+def load_nbt(path: str, compression: Compression = "auto", with_name: bool = False) -> Any:
+    """
+    Read a binary NBT file (level.dat, structure .nbt, playerdata, ...).
+
+    The file is memory-mapped rather than read: uncompressed files are decoded in
+    place and compressed ones are inflated straight from the mapping.
+
+    Args:
+        path: Path to the file
+        compression: "gzip", "zlib", "none" or "auto" to detect it from the header
+        with_name: If True, return (root_name, value) instead of just the value
+
+    Returns:
+        Any: The root tag value (usually a dict)
+    """
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            raise NBTError(f"Empty NBT file: {path}")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            view = memoryview(mm)
+            try:
+                return loads_nbt(view, compression, with_name)
+            finally:
+                view.release()
+
+
+# # # WRITING # # #
+
+def _tag_of(value: Any) -> int:
+    """Pick the tag id used to store a Python value."""
+    if isinstance(value, bool):
+        return TAG_BYTE
+    if isinstance(value, int):
+        return TAG_INT if -2**31 <= value < 2**31 else TAG_LONG
+    if isinstance(value, float):
+        return TAG_DOUBLE
+    if isinstance(value, str):
+        return TAG_STRING
+    if isinstance(value, dict):
+        return TAG_COMPOUND
+    if isinstance(value, list):
+        return TAG_LIST
+    if isinstance(value, array) and value.typecode in _ARRAY_TAGS:
+        return _ARRAY_TAGS[value.typecode]
+    raise NBTError(f"Cannot encode {type(value).__name__} as NBT")
+
+
+def _surrogate_pair(match: re.Match) -> str:
+    code = ord(match.group()) - 0x10000
+    return chr(0xD800 + (code >> 10)) + chr(0xDC00 + (code & 0x3FF))
+
+
+def _write_string(out: io.BytesIO, value: str) -> None:
+    if value.isascii() and "\x00" not in value:
+        raw = value.encode("ascii")
+    else:
+        # Java's readUTF expects "modified UTF-8": supplementary characters as
+        # two 3-byte surrogates and NUL as C0 80
+        value = _SUPPLEMENTARY.sub(_surrogate_pair, value)
+        raw = value.encode("utf-8", "surrogatepass").replace(b"\x00", b"\xc0\x80")
+    if len(raw) > 0xFFFF:
+        raise NBTError("String too long for NBT")
+    out.write(_USHORT.pack(len(raw)))
+    out.write(raw)
+
+
+def _write_payload(out: io.BytesIO, tag: int, value: Any) -> None:
+    st = _SCALARS.get(tag)
+    if st is not None:
+        out.write(st.pack(value))
+    elif tag == TAG_STRING:
+        _write_string(out, value)
+    elif tag == TAG_COMPOUND:
+        for key, child in value.items():
+            if child is None:
+                continue
+            child_tag = _tag_of(child)
+            out.write(_BYTE.pack(child_tag))
+            _write_string(out, str(key))
+            _write_payload(out, child_tag, child)
+        out.write(b"\x00")
+    elif tag == TAG_LIST:
+        if not value:
+            out.write(_BYTE.pack(TAG_END) + _INT.pack(0))
+            return
+        tags = {_tag_of(item) for item in value}
+        if tags == {TAG_INT, TAG_LONG}:
+            tags = {TAG_LONG}
+        if len(tags) != 1:
+            raise NBTError("NBT lists must hold items of a single type")
+        child_tag = tags.pop()
+        out.write(_BYTE.pack(child_tag) + _INT.pack(len(value)))
+        st = _SCALARS.get(child_tag)
+        if st is not None:
+            out.write(struct.pack(f">{len(value)}{st.format[-1]}", *value))
+        else:
+            for item in value:
+                _write_payload(out, child_tag, item)
+    else:
+        values = value
+        if _SWAP and value.itemsize > 1:
+            values = array(value.typecode, value)
+            values.byteswap()
+        out.write(_INT.pack(len(value)))
+        out.write(values.tobytes())
+
+
+def dumps_nbt(obj: Any, compression: Compression = "gzip", name: str = "") -> bytes:
+    """
+    Encode Python objects as binary NBT.
+
+    Python types carry less information than NBT tags, so ints are written as
+    Int (or Long if they don't fit), floats as Double and bools as Byte.
+    array.array('b'/'i'/'q') values are written as byte/int/long arrays.
+
+    This is not type-preserving: Byte, Short and Float tags read by loads_nbt
+    come back as Int and Double, so a load/save round trip changes the file.
+    Strings are encoded as Java's modified UTF-8.
+
+    Args:
+        obj: Root value (usually a dict)
+        compression: "gzip", "zlib" or "none"
+        name: Root tag name
+
+    Returns:
+        bytes: Encoded data
+    """
+    out = io.BytesIO()
+    tag = _tag_of(obj)
+    out.write(_BYTE.pack(tag))
+    _write_string(out, name)
+    _write_payload(out, tag, obj)
+    data = out.getvalue()
+    if compression == "gzip":
+        return gzip.compress(data, mtime=0)
+    if compression == "zlib":
+        return zlib.compress(data)
+    if compression == "none":
+        return data
+    raise ValueError(f"Unknown compression: {compression!r}")
+
+
+def save_nbt(obj: Any, path: str, compression: Compression = "gzip", name: str = "") -> None:
+    """Encode obj as binary NBT and write it to path (see dumps_nbt)."""
+    data = dumps_nbt(obj, compression, name)
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+# Example usage
+if __name__ == "__main__":
+    data = {
+        "DataVersion": 4189,
+        "size": [2, 1, 1],
+        "palette": [{"Name": "minecraft:stone"}, {"Name": "minecraft:dirt"}],
+        "blocks": [{"pos": [0, 0, 0], "state": 0}, {"pos": [1, 0, 0], "state": 1}],
+        "UUID": array('i', [1, -2, 3, -4]),
+    }
+
+    encoded = dumps_nbt(data)
+    print(f"Encoded {len(encoded)} bytes (gzip)")
+    print(f"Round-trip OK: {loads_nbt(encoded) == data}")
@@ -1,12 +1,190 @@
 """
     @author RazrCraft
     @create date 2025-09-13 16:57:05
-    @modify date 2025-09-15 19:41:59
+    @modify date 2026-10-18 00:17:42
     @desc Minecraft SNBT (Stringified Named Binary Tag) parser and manipulator.
  """
+import hashlib
+import io
+import os
 import re
 import json
-from typing import Union, Dict, List, Any
+import multiprocessing
+import sys
+import threading
+from array import array
+from collections import OrderedDict, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Union, Dict, List, Any, Callable, Iterable, Iterator, TextIO
+
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+
+class SNBTError(ValueError):
+    """Raised when an SNBT string cannot be parsed."""
+
+    def __init__(self, message: str, pos: int = -1):
+        if pos >= 0:
+            message = f"{message} (at position {pos})"
+        super().__init__(message)
+        self.pos = pos
+
+
+# Parser states for the tokenizer loop
+_EXPECT_VALUE = 0
+_EXPECT_KEY = 1
+_EXPECT_COLON = 2
+_EXPECT_SEP = 3
+
+_ESCAPES = {'n': '\n', 't': '\t', 'r': '\r'}
+
+_MISSING = object()
+
+# Escapes used when writing quoted strings, and cached newline+indent strings for pretty output
+_ESCAPE_TABLE = str.maketrans({'\\': '\\\\', '\n': '\\n', '\t': '\\t', '\r': '\\r'})
+_INDENTS = ["\n"]
+
+# Typed array prefixes ([B;...], [I;...], [L;...]) and their array.array typecodes
+_ARRAY_TYPECODES = {'B': 'b', 'I': 'i', 'L': 'q'}
+_ARRAY_PREFIXES = {'b': ('B', 'b'), 'i': ('I', ''), 'l': ('L', 'L'), 'q': ('L', 'L')}
+
+_CONTAINERS = (dict, list, array)
+
+# Shared intern table for keys and short string values (see SNBTParser(intern=True))
+_INTERN_TABLE: dict[str, str] = {}
+_INTERN_MAX_LENGTH = 64
+_INTERN_MAX_ENTRIES = 65536
+
+
+def _intern_string(value: str, is_key: bool = False) -> str:
+    """Return the shared copy of a string, adding it to the intern table if allowed."""
+    shared = _INTERN_TABLE.get(value)
+    if shared is not None:
+        return shared
+    if (is_key or len(value) <= _INTERN_MAX_LENGTH) and len(_INTERN_TABLE) < _INTERN_MAX_ENTRIES:
+        _INTERN_TABLE[value] = value
+    return value
+
+
+def intern_table_info() -> dict[str, int]:
+    """Return the number of entries in the shared intern table and the bytes its strings use."""
+    return {
+        "entries": len(_INTERN_TABLE),
+        "string_bytes": sum(sys.getsizeof(v) for v in list(_INTERN_TABLE.values())),
+    }
+
+
+def clear_intern_table() -> None:
+    """Empty the shared intern table (already parsed trees keep their strings)."""
+    _INTERN_TABLE.clear()
+
+
+def memory_report(obj: Any) -> dict[str, int]:
+    """
+    Measure the memory held by a parsed tree (or a list of trees).
+
+    Objects reachable more than once (such as interned strings) are counted once.
+
+    Returns:
+        dict: total_bytes, container_bytes, string_bytes and number_bytes, plus
+              strings (string references) and unique_strings (distinct objects)
+    """
+    seen = set()
+    report = {"total_bytes": 0, "container_bytes": 0, "string_bytes": 0, "number_bytes": 0,
+              "strings": 0, "unique_strings": 0}
+    stack = [obj]
+    while stack:
+        current = stack.pop()
+        if type(current) is str:
+            report["strings"] += 1
+        if id(current) in seen:
+            continue
+        seen.add(id(current))
+        size = sys.getsizeof(current)
+        report["total_bytes"] += size
+        if type(current) is dict:
+            report["container_bytes"] += size
+            stack.extend(current.keys())
+            stack.extend(current.values())
+        elif type(current) is list:
+            report["container_bytes"] += size
+            stack.extend(current)
+        elif type(current) is array:
+            report["container_bytes"] += size
+        elif type(current) is str:
+            report["string_bytes"] += size
+            report["unique_strings"] += 1
+        else:
+            report["number_bytes"] += size
+    return report
+
+
+_KEEP_ALL = {}  # trie leaf: keep the whole subtree
+
+
+@lru_cache(maxsize=64)
+def _compile_keep(paths: frozenset) -> dict:
+    """Turn a set of dot paths into a trie of keys for projection parsing."""
+    trie: dict = {}
+    for path in paths:
+        node = trie
+        parts = path.split('.')
+        for part in parts[:-1]:
+            child = node.get(part)
+            if child is _KEEP_ALL:
+                break  # a shorter path already keeps this whole subtree
+            node = node.setdefault(part, {})
+        else:
+            node[parts[-1]] = _KEEP_ALL
+    return _spread_wildcard(trie)
+
+
+def _merge_keep(a: dict, b: dict) -> dict:
+    """Union of two keep tries; _KEEP_ALL wins over anything."""
+    if a is _KEEP_ALL or b is _KEEP_ALL:
+        return _KEEP_ALL
+    merged = dict(a)
+    for key, child in b.items():
+        merged[key] = _merge_keep(merged[key], child) if key in merged else child
+    return merged
+
+
+def _spread_wildcard(node: dict) -> dict:
+    """Merge each "*" sub-trie into its explicit siblings, so an explicit key doesn't shadow it."""
+    if node is _KEEP_ALL:
+        return node
+    wildcard = node.get('*')
+    result = {}
+    for key, child in node.items():
+        if wildcard is not None and key != '*':
+            child = _merge_keep(child, wildcard)
+        result[key] = _spread_wildcard(child)
+    return result
+
+
+def _encode_array(value: Any) -> Any:
+    """JSON stand-in for typed arrays in fingerprints (tagged with their typecode)."""
+    if type(value) is array:
+        return {"\x00" + value.typecode: value.tolist()}
+    raise TypeError(f"Cannot fingerprint {type(value).__name__}")
+
+
+# Canonical serialization of parsed trees for fingerprint()
+_canonical_encoder = json.JSONEncoder(ensure_ascii=False, sort_keys=True, separators=(",", ":"),
+                                      check_circular=False, default=_encode_array)
+
+
+def _copy_tree(obj: Any) -> Any:
+    """Copy the dicts, lists and arrays of a parsed tree; leaves are immutable and shared."""
+    if type(obj) is dict:
+        return {k: _copy_tree(v) if type(v) in _CONTAINERS else v for k, v in obj.items()}
+    if type(obj) is list:
+        return [_copy_tree(v) if type(v) in _CONTAINERS else v for v in obj]
+    if type(obj) is array:
+        return obj[:]
+    return obj
 
 
 class SNBTParser:
@@ -15,202 +193,491 @@ class SNBTParser:
     
     Supports parsing SNBT strings into Python objects and converting back to SNBT format.
     Handles Minecraft-specific data types like typed numbers (3s, 4.5f, 1L, etc.).
+    Typed arrays ([B;...], [I;...], [L;...]) are parsed into array.array objects
+    with typecodes 'b', 'i' and 'q', and are written back in the same form.
+
+    Parsing is done in a single pass over the input: a tokenizer regex is matched
+    at a moving cursor and the tree is built with an explicit stack, so no
+    substrings are copied and nesting depth is not limited by Python's recursion.
+
+    An optional LRU parse cache (cache_size > 0) remembers the trees of recently
+    parsed strings. Cached trees are never handed out directly: every parse()
+    returns its own copy, so callers can still modify the result freely.
+
+    With intern=True, keys and short string values are deduplicated through a
+    table shared by all parsers, so trees kept around for a long time (inventory
+    snapshots, container indexes) share one copy of "components", "id",
+    "minecraft:stone" and so on. See memory_report() to measure the effect.
     """
     
-    def __init__(self):
+    def __init__(self, cache_size: int = 0, intern: bool = False):
+        """
+        Initialize the parser.
+
+        :param cache_size: max number of SNBT strings kept in the parse cache (0 disables it)
+        :param intern: if True, share keys and short string values through the intern table
+        """
         # Regex patterns for different NBT data types
-        self.typed_number_pattern = re.compile(r'^(-?\d*\.?\d+)([bslfdBSLFD])$')
         self.unquoted_string_pattern = re.compile(r'^[a-zA-Z_][a-zA-Z0-9_]*$')
+        self.number_pattern = re.compile(
+            r'([-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)([bslfdBSLFD]?)')
+        self.escape_pattern = re.compile(r'\\(.)', re.S)
+        # One token per match: punctuation, double/single quoted string or bare word
+        self.token_pattern = re.compile(r"""
+            \s*(?:
+                (?P<punct>[{}\[\],:;])
+              | "(?P<dq>[^"\\]*(?:\\.[^"\\]*)*)"
+              | '(?P<sq>[^'\\]*(?:\\.[^'\\]*)*)'
+              | (?P<word>[-+.\w]+)
+            )""", re.X | re.S)
+        self.typed_array_pattern = re.compile(r'\s*([BIL])\s*;')
+        # Brackets and whole quoted strings, used to skip subtrees without parsing
+        self.skip_pattern = re.compile(r"""[{}\[\]]|"[^"\\]*(?:\\.[^"\\]*)*"|'[^'\\]*(?:\\.[^'\\]*)*'""", re.S)
+        # Parse cache: SNBT string -> parsed tree (private, copied on the way out)
+        self._cache: OrderedDict[str, Any] = OrderedDict()
+        self._cache_size = max(0, int(cache_size))
+        self._cache_lock = threading.Lock()
+        self._cache_hits = 0
+        self._cache_misses = 0
+        self._intern = bool(intern)
     
-    def parse(self, snbt_string: str) -> Union[Dict, List, Any]:
+    def parse(self, snbt_string: str, keep: Iterable[str] | None = None) -> Union[Dict, List, Any]:
         """
         Parse an SNBT string into a Python object.
         
         Args:
             snbt_string (str): The SNBT string to parse
+            keep: Optional dot paths to project on (e.g. {"components.minecraft:lore"}).
+                  Only these subtrees (and the compounds leading to them) are built;
+                  everything else is skipped without being parsed. "*" matches any
+                  key or list index. Lists keep only the selected items, in order.
             
         Returns:
             Union[Dict, List, Any]: Parsed Python object
+
+        Raises:
+            SNBTError: If the string is not valid SNBT
         """
-        snbt_string = snbt_string.strip()
-        if not snbt_string:
-            return None
-            
-        return self._parse_value(snbt_string)
-    
-    def _parse_value(self, value_str: str) -> Any:
-        """Parse a single value (could be compound, list, or primitive)."""
-        value_str = value_str.strip()
+        if keep is not None:
+            snbt_string = snbt_string.strip()
+            if not snbt_string:
+                return None
+            value, pos = self._parse_projected(snbt_string, 0, _compile_keep(frozenset(keep)))
+            if self.token_pattern.match(snbt_string, pos) is not None:
+                raise SNBTError("Unexpected trailing data", pos)
+            return value
         
-        if not value_str:
-            return None
-        
-        # Compound tag (object)
-        if value_str.startswith('{') and value_str.endswith('}'):
-            return self._parse_compound(value_str[1:-1])
+        if not self._cache_size:
+            return self._parse_string(snbt_string)
         
-        # List tag (array)
-        if value_str.startswith('[') and value_str.endswith(']'):
-            return self._parse_list(value_str[1:-1])
+        with self._cache_lock:
+            tree = self._cache.get(snbt_string, _MISSING)
+            if tree is not _MISSING:
+                self._cache.move_to_end(snbt_string)
+                self._cache_hits += 1
+                return _copy_tree(tree)
+            self._cache_misses += 1
         
-        # Primitive values
-        return self._parse_primitive(value_str)
+        tree = self._parse_string(snbt_string)
+        with self._cache_lock:
+            self._cache[snbt_string] = tree
+            while len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+        return _copy_tree(tree)
     
-    def _parse_compound(self, content: str) -> Dict[str, Any]:
-        """Parse compound tag content (inside curly braces)."""
-        if not content.strip():
-            return {}
+    def _parse_string(self, snbt_string: str) -> Any:
+        """Parse a whole SNBT string, bypassing the cache."""
+        snbt_string = snbt_string.strip()
+        if not snbt_string:
+            return None
         
-        result = {}
-        pairs = self._split_key_value_pairs(content)
+        value, pos = self._parse_value(snbt_string, 0)
+        if pos != len(snbt_string):
+            raise SNBTError("Unexpected trailing data", pos)
+        return value
+    
+    def set_cache_size(self, size: int) -> None:
+        """Resize the parse cache, evicting the oldest entries if needed (0 disables it)."""
+        with self._cache_lock:
+            self._cache_size = max(0, int(size))
+            while len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+    
+    def cache_info(self) -> CacheInfo:
+        """Return parse cache statistics as (hits, misses, maxsize, currsize)."""
+        with self._cache_lock:
+            return CacheInfo(self._cache_hits, self._cache_misses, self._cache_size, len(self._cache))
+    
+    def cache_clear(self) -> None:
+        """Empty the parse cache and reset its statistics."""
+        with self._cache_lock:
+            self._cache.clear()
+            self._cache_hits = 0
+            self._cache_misses = 0
+    
+    def _parse_value(self, s: str, pos: int) -> tuple[Any, int]:
+        """
+        Parse one value starting at s[pos].
+
+        Returns the parsed value and the index just past it.
+        """
+        match = self.token_pattern.match
+        intern = _intern_string if self._intern else None
+        stack = []          # open containers: (container, key in parent)
+        container = None    # innermost open container
+        key = None          # pending key in the innermost compound
+        state = _EXPECT_VALUE
         
-        for pair in pairs:
-            if ':' not in pair:
+        while True:
+            m = match(s, pos)
+            if m is None:
+                rest = s[pos:].lstrip()
+                if not rest:
+                    raise SNBTError("Unexpected end of input", len(s))
+                raise SNBTError(f"Unexpected character {rest[0]!r}", len(s) - len(rest))
+            pos = m.end()
+            kind = m.lastgroup
+            tok = m.group(kind)
+            
+            if state == _EXPECT_VALUE:
+                if kind == 'punct':
+                    if tok == '{':
+                        stack.append((container, key))
+                        container = {}
+                        state = _EXPECT_KEY
+                        continue
+                    if tok == '[':
+                        array_match = self.typed_array_pattern.match(s, pos)
+                        if array_match is None:
+                            stack.append((container, key))
+                            container = []
+                            continue
+                        value, pos = self._parse_typed_array(s, array_match)
+                    elif tok == ']' and type(container) is list:
+                        value = container
+                        container, key = stack.pop()
+                    else:
+                        raise SNBTError(f"Unexpected {tok!r}", m.start(kind))
+                elif kind == 'word':
+                    value = self._parse_primitive(tok)
+                    if intern is not None and type(value) is str:
+                        value = intern(value)
+                else:
+                    value = self._unescape(tok) if '\\' in tok else tok
+                    if intern is not None:
+                        value = intern(value)
+            
+            elif state == _EXPECT_KEY:
+                if kind == 'punct':
+                    if tok != '}':
+                        raise SNBTError(f"Expected key, got {tok!r}", m.start(kind))
+                    value = container
+                    container, key = stack.pop()
+                else:
+                    key = self._unescape(tok) if kind != 'word' and '\\' in tok else tok
+                    if intern is not None:
+                        key = intern(key, True)
+                    state = _EXPECT_COLON
+                    continue
+            
+            elif state == _EXPECT_COLON:
+                if tok != ':' or kind != 'punct':
+                    raise SNBTError(f"Expected ':', got {tok!r}", m.start(kind))
+                state = _EXPECT_VALUE
                 continue
             
-            key, value = pair.split(':', 1)
-            key = self._parse_key(key.strip())
-            value = self._parse_value(value.strip())
-            result[key] = value
-        
-        return result
-    
-    def _parse_list(self, content: str) -> List[Any]:
-        """Parse list tag content (inside square brackets)."""
-        if not content.strip():
-            return []
-        
-        items = self._split_list_items(content)
-        return [self._parse_value(item.strip()) for item in items if item.strip()]
+            else:  # _EXPECT_SEP
+                if kind != 'punct':
+                    raise SNBTError(f"Expected ',', got {tok!r}", m.start(kind))
+                if tok == ',':
+                    state = _EXPECT_KEY if type(container) is dict else _EXPECT_VALUE
+                    continue
+                if (tok == '}' and type(container) is dict) or \
+                   (tok == ']' and type(container) is list):
+                    value = container
+                    container, key = stack.pop()
+                else:
+                    raise SNBTError(f"Unexpected {tok!r}", m.start(kind))
+            
+            # A complete value was produced: attach it to its parent
+            if not stack:
+                return value, pos
+            if type(container) is dict:
+                container[key] = value
+            else:
+                container.append(value)
+            state = _EXPECT_SEP
     
     def _parse_primitive(self, value_str: str) -> Any:
-        """Parse primitive values (strings, numbers, booleans)."""
-        value_str = value_str.strip()
+        """Parse an unquoted token (numbers, booleans, bare strings)."""
+        first = value_str[0]
+        if first.isdigit() or first in '-+.':
+            match = self.number_pattern.fullmatch(value_str)
+            if match:
+                number_str, type_suffix = match.groups()
+                return self._convert_typed_number(number_str, type_suffix.lower())
         
         # Boolean values
-        if value_str.lower() == 'true':
+        lowered = value_str.lower()
+        if lowered == 'true':
             return True
-        if value_str.lower() == 'false':
+        if lowered == 'false':
             return False
         
-        # Quoted strings
-        if (value_str.startswith('"') and value_str.endswith('"')) or \
-           (value_str.startswith("'") and value_str.endswith("'")):
-            return value_str[1:-1]
-        
-        # Typed numbers (e.g., 3s, 4.5f, 1L)
-        match = self.typed_number_pattern.match(value_str)
-        if match:
-            number_str, type_suffix = match.groups()
-            return self._convert_typed_number(number_str, type_suffix.lower())
-        
-        # Regular numbers
+        # Anything else is an unquoted string
+        return value_str
+    
+    def _parse_typed_array(self, s: str, array_match: re.Match) -> tuple[array, int]:
+        """
+        Parse the items of a typed array whose "[X;" prefix was matched.
+
+        Returns the array and the index just past its closing bracket.
+        """
+        prefix = array_match.group(1)
+        start = array_match.end()
+        end = s.find(']', start)
+        if end < 0:
+            raise SNBTError("Unterminated typed array", start)
+        items = s[start:end].split(',')
+        if not items[-1].strip():
+            items.pop()  # empty array or trailing comma
         try:
-            if '.' in value_str:
-                return float(value_str)
-            else:
-                return int(value_str)
+            values = [int(item.strip().rstrip('bBlL')) for item in items]
         except ValueError:
-            pass
-        
-        # Unquoted strings (must be valid identifiers)
-        if self.unquoted_string_pattern.match(value_str):
-            return value_str
-        
-        # Default to string if nothing else matches
-        return value_str
+            values = [self._parse_primitive(item.strip()) if item.strip() else None for item in items]
+            if any(type(v) not in (int, bool) for v in values):
+                raise SNBTError(f"Invalid item in {prefix} array", start) from None
+        try:
+            return array(_ARRAY_TYPECODES[prefix], values), end + 1
+        except OverflowError:
+            raise SNBTError(f"Value out of range in {prefix} array", start) from None
     
-    def _parse_key(self, key_str: str) -> str:
-        """Parse a key (remove quotes if present)."""
-        key_str = key_str.strip()
-        if (key_str.startswith('"') and key_str.endswith('"')) or \
-           (key_str.startswith("'") and key_str.endswith("'")):
-            return key_str[1:-1]
-        return key_str
+    def _unescape(self, value_str: str) -> str:
+        """Resolve backslash escapes inside a quoted string."""
+        return self.escape_pattern.sub(lambda m: _ESCAPES.get(m.group(1), m.group(1)), value_str)
     
     def _convert_typed_number(self, number_str: str, type_suffix: str) -> Union[int, float]:
         """Convert typed numbers to appropriate Python types."""
+        is_integral = not any(c in number_str for c in '.eE')
         if type_suffix in ['b', 's', 'l']:  # byte, short, long
-            return int(float(number_str))
+            return int(number_str) if is_integral else int(float(number_str))
         elif type_suffix in ['f', 'd']:  # float, double
             return float(number_str)
-        return float(number_str) if '.' in number_str else int(number_str)
-    
-    def _split_key_value_pairs(self, content: str) -> List[str]:
-        """Split compound content into key-value pairs, respecting nested structures."""
-        pairs = []
-        current_pair = ""
-        brace_depth = 0
-        bracket_depth = 0
-        in_quotes = False
-        quote_char = None
-        
-        for char in content:
-            if not in_quotes:
-                if char in ['"', "'"]:
-                    in_quotes = True
-                    quote_char = char
-                elif char == '{':
-                    brace_depth += 1
-                elif char == '}':
-                    brace_depth -= 1
-                elif char == '[':
-                    bracket_depth += 1
-                elif char == ']':
-                    bracket_depth -= 1
-                elif char == ',' and brace_depth == 0 and bracket_depth == 0:
-                    pairs.append(current_pair.strip())
-                    current_pair = ""
-                    continue
+        return int(number_str) if is_integral else float(number_str)
+    
+    def extract(self, snbt_string: str, path: str, default=None) -> Any:
+        """
+        Get a value straight from an SNBT string using dot notation.
+
+        Only the value at the path is parsed; every unrelated subtree is skipped
+        by bracket matching, so this is much cheaper than parse() followed by get()
+        when a single value is needed.
+
+        Args:
+            snbt_string (str): The SNBT string to read from
+            path: Dot-separated path (e.g., "components.minecraft:custom_name")
+            default: Default value if path not found
+
+        Returns:
+            Any: Value at the specified path or default
+
+        Raises:
+            SNBTError: If the scanned part of the string is not valid SNBT
+        """
+        s = snbt_string
+        pos = 0
+        parts = path.split('.')
+        for depth, part in enumerate(parts):
+            m = self.token_pattern.match(s, pos)
+            if m is None or m.lastgroup != 'punct':
+                return default
+            if m.group('punct') == '{':
+                pos = self._seek_key(s, m.end(), part)
+            elif m.group('punct') == '[':
+                try:
+                    index = int(part)
+                except ValueError:
+                    return default
+                if self.typed_array_pattern.match(s, m.end()):
+                    # Typed arrays only hold numbers, so they end the path
+                    values, _ = self._parse_value(s, pos)
+                    if depth != len(parts) - 1 or not 0 <= index < len(values):
+                        return default
+                    return values[index]
+                pos = self._seek_index(s, m.end(), index) if index >= 0 else -1
             else:
-                if char == quote_char:
-                    in_quotes = False
-                    quote_char = None
-            
-            current_pair += char
+                return default
+            if pos < 0:
+                return default
         
-        if current_pair.strip():
-            pairs.append(current_pair.strip())
+        value, _ = self._parse_value(s, pos)
+        return value
+    
+    def fingerprint(self, snbt_string: str) -> str:
+        """
+        Return a stable content hash of an SNBT string.
+
+        The string is parsed (through the parse cache, if enabled) and the tree
+        is serialized canonically, with compound keys sorted, so equal data gives
+        equal fingerprints whatever the key order, whitespace or quoting. The hash
+        is exactly as strict as the parsed tree: 1b and 1 both parse to the int 1
+        and hash the same, while 1, 1.0 and true differ, and so do typed arrays
+        of different element types. The result is stable across processes and runs.
+
+        Args:
+            snbt_string (str): The SNBT string to fingerprint
+
+        Returns:
+            str: 32-character hex digest
+
+        Raises:
+            SNBTError: If the string is not valid SNBT
+        """
+        text = _canonical_encoder.encode(self.parse(snbt_string))
+        return hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).hexdigest()
+    
+    def _parse_projected(self, s: str, pos: int, trie: dict) -> tuple[Any, int]:
+        """
+        Parse the value at s[pos], keeping only the parts selected by trie.
+
+        trie maps keys (or "*") to sub-tries; _KEEP_ALL marks a fully kept subtree.
+        """
+        m = self.token_pattern.match(s, pos)
+        if m is None or m.lastgroup != 'punct' or m.group('punct') not in '{[' or \
+           self.typed_array_pattern.match(s, m.end()):
+            # Primitives and typed arrays have no parts to select from
+            return self._parse_value(s, pos)
         
-        return pairs
-    
-    def _split_list_items(self, content: str) -> List[str]:
-        """Split list content into items, respecting nested structures."""
-        items = []
-        current_item = ""
-        brace_depth = 0
-        bracket_depth = 0
-        in_quotes = False
-        quote_char = None
+        pos = m.end()
+        wildcard = trie.get('*')
+        if m.group('punct') == '{':
+            result = {}
+            while True:
+                m = self.token_pattern.match(s, pos)
+                if m is None:
+                    raise SNBTError("Expected key", pos)
+                kind = m.lastgroup
+                if kind == 'punct':
+                    if m.group(kind) == '}':
+                        return result, m.end()
+                    raise SNBTError(f"Expected key, got {m.group(kind)!r}", m.start(kind))
+                key = m.group(kind)
+                if kind != 'word' and '\\' in key:
+                    key = self._unescape(key)
+                tok, pos = self._next_punct(s, m.end())
+                if tok != ':':
+                    raise SNBTError(f"Expected ':', got {tok!r}", pos - 1)
+                sub = trie.get(key, wildcard)
+                if sub is None:
+                    pos = self._skip_value(s, pos)
+                elif sub is _KEEP_ALL:
+                    result[key], pos = self._parse_value(s, pos)
+                else:
+                    result[key], pos = self._parse_projected(s, pos, sub)
+                tok, pos = self._next_punct(s, pos)
+                if tok == '}':
+                    return result, pos
+                if tok != ',':
+                    raise SNBTError(f"Unexpected {tok!r}", pos - 1)
         
-        for char in content:
-            if not in_quotes:
-                if char in ['"', "'"]:
-                    in_quotes = True
-                    quote_char = char
-                elif char == '{':
-                    brace_depth += 1
-                elif char == '}':
-                    brace_depth -= 1
-                elif char == '[':
-                    bracket_depth += 1
-                elif char == ']':
-                    bracket_depth -= 1
-                elif char == ',' and brace_depth == 0 and bracket_depth == 0:
-                    items.append(current_item.strip())
-                    current_item = ""
-                    continue
+        result = []
+        index = 0
+        while True:
+            m = self.token_pattern.match(s, pos)
+            if m is not None and m.group('punct') == ']':
+                return result, m.end()
+            sub = trie.get(str(index), wildcard)
+            if sub is None:
+                pos = self._skip_value(s, pos)
+            elif sub is _KEEP_ALL:
+                value, pos = self._parse_value(s, pos)
+                result.append(value)
             else:
-                if char == quote_char:
-                    in_quotes = False
-                    quote_char = None
-            
-            current_item += char
-        
-        if current_item.strip():
-            items.append(current_item.strip())
-        
-        return items
+                value, pos = self._parse_projected(s, pos, sub)
+                result.append(value)
+            index += 1
+            tok, pos = self._next_punct(s, pos)
+            if tok == ']':
+                return result, pos
+            if tok != ',':
+                raise SNBTError(f"Unexpected {tok!r}", pos - 1)
+    
+    def _next_punct(self, s: str, pos: int) -> tuple[str, int]:
+        """Return the punctuation token at s[pos] and the index past it."""
+        m = self.token_pattern.match(s, pos)
+        if m is None or m.lastgroup != 'punct':
+            raise SNBTError("Expected ',' or closing bracket", pos)
+        return m.group('punct'), m.end()
+    
+    def _seek_key(self, s: str, pos: int, wanted: str) -> int:
+        """
+        Scan a compound whose '{' ends at pos for the key wanted.
+
+        Returns the index where its value starts, or -1 if the key is absent.
+        """
+        match = self.token_pattern.match
+        while True:
+            m = match(s, pos)
+            if m is None:
+                raise SNBTError("Expected key", pos)
+            kind = m.lastgroup
+            if kind == 'punct':
+                if m.group(kind) == '}':
+                    return -1
+                raise SNBTError(f"Expected key, got {m.group(kind)!r}", m.start(kind))
+            key = m.group(kind)
+            if kind != 'word' and '\\' in key:
+                key = self._unescape(key)
+            tok, pos = self._next_punct(s, m.end())
+            if tok != ':':
+                raise SNBTError(f"Expected ':', got {tok!r}", pos - 1)
+            if key == wanted:
+                return pos
+            tok, pos = self._next_punct(s, self._skip_value(s, pos))
+            if tok == '}':
+                return -1
+            if tok != ',':
+                raise SNBTError(f"Unexpected {tok!r}", pos - 1)
+    
+    def _seek_index(self, s: str, pos: int, index: int) -> int:
+        """
+        Scan a list whose '[' ends at pos for the item at index.
+
+        Returns the index where the item starts, or -1 if the list is shorter.
+        """
+        for _ in range(index):
+            m = self.token_pattern.match(s, pos)
+            if m is not None and m.group('punct') == ']':
+                return -1
+            tok, pos = self._next_punct(s, self._skip_value(s, pos))
+            if tok == ']':
+                return -1
+            if tok != ',':
+                raise SNBTError(f"Unexpected {tok!r}", pos - 1)
+        m = self.token_pattern.match(s, pos)
+        if m is not None and m.group('punct') == ']':
+            return -1
+        return pos
+    
+    def _skip_value(self, s: str, pos: int) -> int:
+        """Return the index just past the value starting at s[pos], without parsing it."""
+        m = self.token_pattern.match(s, pos)
+        if m is None:
+            raise SNBTError("Unexpected end of input", pos)
+        if m.lastgroup != 'punct':
+            return m.end()
+        if m.group('punct') not in '{[':
+            raise SNBTError(f"Unexpected {m.group('punct')!r}", m.start('punct'))
+        depth = 0
+        for m in self.skip_pattern.finditer(s, m.start('punct')):
+            c = m.group()[0]
+            if c == '{' or c == '[':
+                depth += 1
+            elif c == '}' or c == ']':
+                depth -= 1
+                if depth == 0:
+                    return m.end()
+        raise SNBTError("Unexpected end of input", len(s))
     
     def to_snbt(self, obj: Any, pretty: bool = False, indent: int = 0) -> str:
         """
@@ -219,68 +686,100 @@ class SNBTParser:
         Args:
             obj: Python object to convert
             pretty: Whether to format with indentation
-            indent: Current indentation level (for internal use)
+            indent: Starting indentation level
             
         Returns:
             str: SNBT string representation
         """
+        buffer = io.StringIO()
+        self._write(obj, buffer.write, pretty, indent)
+        return buffer.getvalue()
+    
+    def dump(self, obj: Any, fp: TextIO, pretty: bool = False) -> None:
+        """
+        Write a Python object as SNBT to a file-like object.
+
+        The output is produced in a single traversal straight into fp, without
+        building intermediate strings for nested values.
+
+        Args:
+            obj: Python object to convert
+            fp: Text sink with a write() method (file, io.StringIO, ...)
+            pretty: Whether to format with indentation
+        """
+        self._write(obj, fp.write, pretty, 0)
+    
+    def _write(self, obj: Any, write: Callable[[str], Any], pretty: bool, indent: int) -> None:
+        """Write one value through write()."""
         if obj is None:
-            return ""
+            return
         
         if isinstance(obj, bool):
-            return "true" if obj else "false"
-        
-        if isinstance(obj, (int, float)):
-            return str(obj)
-        
-        if isinstance(obj, str):
-            # Use quotes if the string contains special characters
-            if self.unquoted_string_pattern.match(obj) and obj not in ['true', 'false']:
-                return obj
-            else:
-                return f'"{obj}"'
-        
-        if isinstance(obj, dict):
-            return self._dict_to_snbt(obj, pretty, indent)
-        
-        if isinstance(obj, list):
-            return self._list_to_snbt(obj, pretty, indent)
-        
-        return str(obj)
-    
-    def _dict_to_snbt(self, obj: dict, pretty: bool, indent: int) -> str:
-        """Convert dictionary to SNBT compound tag."""
-        if not obj:
-            return "{}"
-        
-        items = []
-        for key, value in obj.items():
-            key_str = key if self.unquoted_string_pattern.match(key) else f'"{key}"'
-            value_str = self.to_snbt(value, pretty, indent + 1)
-            items.append(f"{key_str}:{value_str}")
-        
-        if pretty:
-            indent_str = "  " * indent
-            inner_indent_str = "  " * (indent + 1)
-            content = f",\n{inner_indent_str}".join(items)
-            return f"{{\n{inner_indent_str}{content}\n{indent_str}}}"
+            write("true" if obj else "false")
+        elif isinstance(obj, (int, float)):
+            write(str(obj))
+        elif isinstance(obj, str):
+            write(self._quote(obj))
+        elif isinstance(obj, dict):
+            if not obj:
+                write("{}")
+                return
+            separator, closing = self._separators(pretty, indent)
+            write("{" + separator[1:])
+            first = True
+            for key, value in obj.items():
+                if not first:
+                    write(separator)
+                first = False
+                write(self._quote(str(key)))
+                write(":")
+                self._write(value, write, pretty, indent + 1)
+            write(closing + "}")
+        elif isinstance(obj, list):
+            if not obj:
+                write("[]")
+                return
+            separator, closing = self._separators(pretty, indent)
+            write("[" + separator[1:])
+            first = True
+            for item in obj:
+                if not first:
+                    write(separator)
+                first = False
+                self._write(item, write, pretty, indent + 1)
+            write(closing + "]")
+        elif isinstance(obj, array):
+            write(self._array_to_snbt(obj))
         else:
-            return "{" + ",".join(items) + "}"
+            write(str(obj))
     
-    def _list_to_snbt(self, obj: list, pretty: bool, indent: int) -> str:
-        """Convert list to SNBT list tag."""
-        if not obj:
-            return "[]"
-        
-        items = [self.to_snbt(item, pretty, indent + 1) for item in obj]
-        
-        if pretty:
-            indent_str = "  " * indent
-            inner_indent_str = "  " * (indent + 1)
-            content = f",\n{inner_indent_str}".join(items)
-            return f"[\n{inner_indent_str}{content}\n{indent_str}]"
-        else:
-            return "[" + ",".join(items) + "]"
+    def _separators(self, pretty: bool, indent: int) -> tuple[str, str]:
+        """Return the item separator and the text before the closing bracket."""
+        if not pretty:
+            return ",", ""
+        while len(_INDENTS) <= indent + 1:
+            _INDENTS.append("\n" + "  " * len(_INDENTS))
+        return "," + _INDENTS[indent + 1], _INDENTS[indent]
+    
+    def _quote(self, value: str) -> str:
+        """Return a string as a bare word if possible, otherwise quoted and escaped."""
+        if self.unquoted_string_pattern.fullmatch(value) and value not in ['true', 'false']:
+            return value
+        if '\\' in value or '\n' in value or '\t' in value or '\r' in value:
+            value = value.translate(_ESCAPE_TABLE)
+        # Prefer the quote that needs no escaping, like Minecraft does
+        if '"' not in value:
+            return f'"{value}"'
+        if "'" not in value:
+            return f"'{value}'"
+        return '"' + value.replace('"', '\\"') + '"'
+    
+    def _array_to_snbt(self, obj: array) -> str:
+        """Convert an integer array.array to an SNBT typed array tag."""
+        if obj.typecode not in _ARRAY_PREFIXES:
+            raise ValueError(f"Unsupported array typecode: {obj.typecode!r}")
+        prefix, suffix = _ARRAY_PREFIXES[obj.typecode]
+        return f"[{prefix};" + ",".join(f"{v}{suffix}" for v in obj) + "]"
     
     def get(self, obj: dict, path: str, default=None) -> Any:
         """
@@ -288,7 +787,8 @@ class SNBTParser:
         
         Args:
             obj: Parsed SNBT object (dictionary)
-            path: Dot-separated path (e.g., "player.Inventory.0.Count")
+            path: Dot-separated path (e.g., "player.Inventory.0.Count").
+                  May contain "*" and slice ("1:3") segments, see NBTPath.
             default: Default value if path not found
             
         Returns:
@@ -297,28 +797,7 @@ class SNBTParser:
         if not isinstance(obj, dict):
             return default
         
-        current = obj
-        parts = path.split('.')
-        
-        for part in parts:
-            if isinstance(current, dict):
-                if part in current:
-                    current = current[part]
-                else:
-                    return default
-            elif isinstance(current, list):
-                try:
-                    index = int(part)
-                    if 0 <= index < len(current):
-                        current = current[index]
-                    else:
-                        return default
-                except ValueError:
-                    return default
-            else:
-                return default
-        
-        return current
+        return compile_path(path).get(obj, default)
     
     def set(self, obj: dict, path: str, value: Any) -> None:
         """
@@ -347,14 +826,548 @@ class SNBTParser:
             current[parts[-1]] = value
 
 
+class SNBTEventParser:
+    """
+    Incremental (SAX-style) SNBT parser.
+
+    Text is pushed in chunks with feed(), which yields events as soon as they are
+    complete. Only the unconsumed tail of the input and the current nesting path
+    are kept, so arbitrarily large dumps can be processed in constant memory.
+
+    Events are (event, path, value) tuples, where path is a tuple of the keys and
+    list indices leading to the value:
+        ("start_compound", path, None)   ("end_compound", path, None)
+        ("start_list", path, None)       ("end_list", path, None)
+        ("key", path, key)               ("value", path, value)
+
+    If select is given (a dot path where "*" matches any key or index), only
+    ("value", path, value) events are yielded, one per matching path, with
+    compounds and lists at those paths fully materialized.
+
+    Example:
+        parser = SNBTEventParser(select="Items.*.id")
+        with open("chest.snbt", encoding="utf-8") as f:
+            for chunk in iter(lambda: f.read(65536), ""):
+                for _, path, item_id in parser.feed(chunk):
+                    print(path, item_id)
+        for _, path, item_id in parser.close():
+            print(path, item_id)
+    """
+
+    def __init__(self, select: str | None = None):
+        self._parser = SNBTParser()
+        self._match = self._parser.token_pattern.match
+        self._array_prefix_pattern = re.compile(r'\s*(?:[BIL]\s*)?')
+        self._buffer = ""
+        self._stack: list[str] = []       # open containers: '{' or '['
+        self._path: list = []             # path of the next value
+        self._state = _EXPECT_VALUE
+        self._done = False
+        self._select = tuple(select.split('.')) if select is not None else None
+        self._capture: list | None = None  # containers of a selected subtree being built
+        self._capture_key = None
+
+    def feed(self, chunk: str) -> Iterator[tuple[str, tuple, Any]]:
+        """Add a chunk of SNBT text and yield the events it completes."""
+        self._buffer += chunk
+        return iter(self._consume(final=False))
+
+    def close(self) -> Iterator[tuple[str, tuple, Any]]:
+        """Signal the end of input and yield the remaining events."""
+        events = self._consume(final=True)
+        if not self._done:
+            raise SNBTError("Unexpected end of input")
+        return iter(events)
+
+    def _consume(self, final: bool) -> list:
+        """Tokenize as much of the buffer as possible and return the produced events."""
+        out = []
+        buf = self._buffer
+        pos = 0
+        end = len(buf)
+        while True:
+            m = self._match(buf, pos)
+            if m is None:
+                rest = buf[pos:].lstrip()
+                if not rest:
+                    break
+                if not final and rest[0] in '"\'':
+                    break  # quoted string continues in the next chunk
+                raise SNBTError(f"Unexpected character {rest[0]!r}")
+            if self._done:
+                raise SNBTError("Unexpected trailing data")
+            kind = m.lastgroup
+            if kind == 'word' and m.end() == end and not final:
+                break  # the word may continue in the next chunk
+            if kind == 'punct' and m.group(kind) == '[' and self._state == _EXPECT_VALUE:
+                # Typed arrays are emitted whole, as a single value event
+                array_match = self._parser.typed_array_pattern.match(buf, m.end())
+                if array_match is None:
+                    if not final and self._array_prefix_pattern.fullmatch(buf, m.end()):
+                        break  # "[I" could still become "[I;"
+                elif final or buf.find(']', array_match.end()) >= 0:
+                    value, pos = self._parser._parse_typed_array(buf, array_match)
+                    self._emit(out, "value", value)
+                    self._value_done()
+                    continue
+                else:
+                    break  # wait for the closing bracket
+            pos = m.end()
+            self._token(kind, m.group(kind), out)
+        self._buffer = buf[pos:]
+        return out
+
+    def _token(self, kind: str, tok: str, out: list) -> None:
+        """Advance the state machine by one token."""
+        state = self._state
+        if state == _EXPECT_VALUE:
+            if kind == 'punct':
+                if tok == '{':
+                    self._emit(out, "start_compound", None)
+                    self._stack.append('{')
+                    self._state = _EXPECT_KEY
+                elif tok == '[':
+                    self._emit(out, "start_list", None)
+                    self._stack.append('[')
+                    self._path.append(0)
+                elif tok == ']' and self._stack and self._stack[-1] == '[':
+                    self._end_list(out)
+                else:
+                    raise SNBTError(f"Unexpected {tok!r}")
+            else:
+                if kind == 'word':
+                    value = self._parser._parse_primitive(tok)
+                else:
+                    value = self._parser._unescape(tok) if '\\' in tok else tok
+                self._emit(out, "value", value)
+                self._value_done()
+        elif state == _EXPECT_KEY:
+            if kind == 'punct':
+                if tok != '}':
+                    raise SNBTError(f"Expected key, got {tok!r}")
+                self._end_compound(out)
+            else:
+                key = self._parser._unescape(tok) if kind != 'word' and '\\' in tok else tok
+                self._path.append(key)
+                self._emit(out, "key", key)
+                self._state = _EXPECT_COLON
+        elif state == _EXPECT_COLON:
+            if kind != 'punct' or tok != ':':
+                raise SNBTError(f"Expected ':', got {tok!r}")
+            self._state = _EXPECT_VALUE
+        else:  # _EXPECT_SEP
+            if kind != 'punct':
+                raise SNBTError(f"Expected ',', got {tok!r}")
+            top = self._stack[-1]
+            if tok == ',':
+                self._state = _EXPECT_KEY if top == '{' else _EXPECT_VALUE
+            elif tok == '}' and top == '{':
+                self._end_compound(out)
+            elif tok == ']' and top == '[':
+                self._end_list(out)
+            else:
+                raise SNBTError(f"Unexpected {tok!r}")
+
+    def _end_compound(self, out: list) -> None:
+        self._stack.pop()
+        self._emit(out, "end_compound", None)
+        self._value_done()
+
+    def _end_list(self, out: list) -> None:
+        self._stack.pop()
+        self._path.pop()
+        self._emit(out, "end_list", None)
+        self._value_done()
+
+    def _value_done(self) -> None:
+        """Move past a completed value in the enclosing container."""
+        if not self._stack:
+            self._done = True
+        elif self._stack[-1] == '{':
+            self._path.pop()
+        else:
+            self._path[-1] += 1
+        self._state = _EXPECT_SEP
+
+    def _emit(self, out: list, event: str, value: Any) -> None:
+        """Record an event, or route it through the selected-subtree builder."""
+        if self._select is None:
+            out.append((event, tuple(self._path), value))
+            return
+        
+        capture = self._capture
+        if capture is None:
+            if event == "key" or event.startswith("end") or not self._selected():
+                return
+            if event == "value":
+                out.append((event, tuple(self._path), value))
+                return
+            self._capture = [{} if event == "start_compound" else []]
+            return
+        
+        if event == "key":
+            self._capture_key = value
+            return
+        if event.startswith("end"):
+            done = capture.pop()
+            if not capture:
+                self._capture = None
+                out.append(("value", tuple(self._path), done))
+            return
+        if event == "value":
+            child = value
+        else:
+            child = {} if event == "start_compound" else []
+        top = capture[-1]
+        if type(top) is dict:
+            top[self._capture_key] = child
+        else:
+            top.append(child)
+        if event != "value":
+            capture.append(child)
+
+    def _selected(self) -> bool:
+        """True if the current path matches the select pattern."""
+        select = self._select
+        path = self._path
+        if len(path) != len(select):
+            return False
+        for want, part in zip(select, path):
+            if want != '*' and want != str(part):
+                return False
+        return True
+
+
+def iter_snbt_events(chunks: Iterable[str], select: str | None = None) -> Iterator[tuple[str, tuple, Any]]:
+    """
+    Stream SNBT events from an iterable of text chunks (e.g. a file object).
+
+    See SNBTEventParser for the event format and the select argument.
+    """
+    parser = SNBTEventParser(select)
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+    yield from parser.close()
+
+
+# Path segment kinds
+_SEG_KEY = 0
+_SEG_WILDCARD = 1
+_SEG_SLICE = 2
+
+_slice_pattern = re.compile(r'^(-?\d*):(-?\d*)(?::(-?\d*))?$')
+
+
+class NBTPath:
+    """
+    Compiled dot path for reading parsed SNBT data.
+
+    The path string is split and classified once, so the same accessor can be
+    applied to many objects. Segments are:
+        key      dict key, or list index if it is an integer ("Inventory.0.id")
+        *        every value of a dict or every item of a list
+        a:b[:c]  slice of a list (e.g. "0:3", "-2:"); looked up as a key on dicts
+                 (and always a key if the step c is 0)
+
+    If the path has a wildcard or slice segment, get() returns the list of all
+    matches (possibly empty) instead of a single value.
+
+    Example:
+        levels = compile_path("components.minecraft:enchantments.levels.*")
+        for item in items:
+            print(levels.get(item))
+    """
+    __slots__ = ("path", "_segments", "_multi")
+
+    def __init__(self, path: str):
+        self.path = path
+        segments = []
+        for part in path.split('.'):
+            if part == '*':
+                segments.append((_SEG_WILDCARD, part, None))
+                continue
+            match = _slice_pattern.match(part)
+            if match:
+                bounds = [int(b) if b else None for b in match.groups()]
+                if bounds[2] != 0:
+                    segments.append((_SEG_SLICE, part, slice(*bounds)))
+                    continue
+                # A zero step is not a valid slice: the segment is a plain key
+            try:
+                index = int(part)
+            except ValueError:
+                index = None
+            segments.append((_SEG_KEY, part, index))
+        self._segments = tuple(segments)
+        self._multi = any(kind != _SEG_KEY for kind, _, _ in segments)
+
+    @property
+    def is_multi(self) -> bool:
+        """True if the path has wildcard or slice segments."""
+        return self._multi
+
+    def get(self, obj: Any, default=None) -> Any:
+        """
+        Get the value at this path.
+
+        Args:
+            obj: Parsed SNBT object
+            default: Default value if path not found (single-value paths only)
+
+        Returns:
+            Any: Value at the path or default, or a list of matches for
+                 wildcard/slice paths
+        """
+        if not self._multi:
+            current = obj
+            for _, part, index in self._segments:
+                if isinstance(current, dict):
+                    if part not in current:
+                        return default
+                    current = current[part]
+                elif isinstance(current, (list, array)):
+                    if index is None or not 0 <= index < len(current):
+                        return default
+                    current = current[index]
+                else:
+                    return default
+            return current
+        
+        matches = [obj]
+        for kind, part, arg in self._segments:
+            step = []
+            for current in matches:
+                if isinstance(current, dict):
+                    if kind == _SEG_WILDCARD:
+                        step.extend(current.values())
+                    elif part in current:
+                        step.append(current[part])
+                elif isinstance(current, (list, array)):
+                    if kind == _SEG_WILDCARD:
+                        step.extend(current)
+                    elif kind == _SEG_SLICE:
+                        step.extend(current[arg])
+                    elif arg is not None and 0 <= arg < len(current):
+                        step.append(current[arg])
+            matches = step
+            if not matches:
+                break
+        return matches
+
+    __call__ = get
+
+    def __repr__(self):
+        return f"<NBTPath {self.path!r}>"
+
+
+@lru_cache(maxsize=256)
+def compile_path(path: str) -> NBTPath:
+    """
+    Compile a dot path into a reusable NBTPath accessor.
+
+    Compiled paths are kept in an LRU cache keyed by the path string, so calling
+    this repeatedly with the same path is cheap.
+    """
+    return NBTPath(path)
+
+
+def _same_leaf(a: Any, b: Any) -> bool:
+    """Equality of two non-container values that also tells apart 1, 1.0 and True and array types."""
+    t = type(a)
+    return t is type(b) and a == b and (t is not array or a.typecode == b.typecode)
+
+
+class NBTDiffer:
+    """
+    Structural diff between parsed NBT trees.
+
+    Operations are (op, path, value) tuples, where path is a tuple of keys and
+    list indices (like SNBTEventParser paths):
+        ("add", path, value)      key or list item added
+        ("remove", path, None)    key or list item removed
+        ("change", path, value)   value replaced (leaves, typed arrays, type changes)
+
+    Both trees are walked once, side by side, and values are compared type-strictly
+    (1b and 1.0f differ). Subtrees that are the same object are skipped without
+    looking inside them. Snapshots passed to update() must not be mutated
+    afterwards.
+
+    Example:
+        differ = NBTDiffer()
+        while True:
+            for op, path, value in differ.update(parse_snbt(container_snbt)):
+                print(op, path, value)
+    """
+
+    def __init__(self, snapshot: Any = None):
+        self._snapshot = snapshot
+
+    def diff(self, old: Any, new: Any) -> list[tuple[str, tuple, Any]]:
+        """Return the operations that turn old into new."""
+        ops = []
+        if old is not new:
+            self._walk(old, new, (), ops)
+        return ops
+
+    def update(self, new: Any) -> list[tuple[str, tuple, Any]]:
+        """Diff new against the previous snapshot, then make new the snapshot."""
+        ops = self.diff(self._snapshot, new)
+        self._snapshot = new
+        return ops
+
+    def _walk(self, old: Any, new: Any, path: tuple, ops: list) -> None:
+        t = type(old)
+        if t is not type(new) or (t is not dict and t is not list):
+            if not _same_leaf(old, new):
+                ops.append(("change", path, new))
+            return
+        
+        if t is dict:
+            for key in old:
+                if key not in new:
+                    ops.append(("remove", path + (key,), None))
+            for key, value in new.items():
+                if key not in old:
+                    ops.append(("add", path + (key,), value))
+                    continue
+                before = old[key]
+                if before is value:
+                    continue
+                tb = type(before)
+                if tb is not dict and tb is not list:
+                    # Leaves are compared here instead of in a call per key
+                    if not _same_leaf(before, value):
+                        ops.append(("change", path + (key,), value))
+                    continue
+                self._walk(before, value, path + (key,), ops)
+            return
+        
+        common = min(len(old), len(new))
+        for index in range(common):
+            before = old[index]
+            value = new[index]
+            if before is value:
+                continue
+            tb = type(before)
+            if tb is not dict and tb is not list:
+                if not _same_leaf(before, value):
+                    ops.append(("change", path + (index,), value))
+                continue
+            self._walk(before, value, path + (index,), ops)
+        # Remove from the end first so the indices stay valid while patching
+        for index in range(len(old) - 1, common - 1, -1):
+            ops.append(("remove", path + (index,), None))
+        for index in range(common, len(new)):
+            ops.append(("add", path + (index,), new[index]))
+
+
+def diff_nbt(old: Any, new: Any) -> list[tuple[str, tuple, Any]]:
+    """Return the (op, path, value) operations that turn old into new (see NBTDiffer)."""
+    return NBTDiffer().diff(old, new)
+
+
+def apply_patch(obj: Any, ops: Iterable[tuple[str, tuple, Any]]) -> Any:
+    """
+    Apply diff_nbt operations to a parsed tree, modifying it in place.
+
+    Added and changed values are copied, so the patched tree does not share
+    containers with the tree the operations came from.
+
+    Returns:
+        Any: The patched tree (a new object only if the root itself was changed)
+    """
+    for op, path, value in ops:
+        if not path:
+            obj = _copy_tree(value) if op != "remove" else None
+            continue
+        parent = obj
+        for part in path[:-1]:
+            parent = parent[part]
+        last = path[-1]
+        if op == "remove":
+            del parent[last]
+        elif op == "add" and type(parent) is list:
+            parent.insert(last, _copy_tree(value))
+        else:
+            parent[last] = _copy_tree(value)
+    return obj
+
+
 # Global parser instance for convenience functions
 _parser = SNBTParser()
 
 
 # Example usage and utility functions
-def parse_snbt(snbt_string: str) -> Union[Dict, List, Any]:
-    """Quick function to parse SNBT string."""
-    return _parser.parse(snbt_string)
+def parse_snbt(snbt_string: str, keep: Iterable[str] | None = None) -> Union[Dict, List, Any]:
+    """Quick function to parse SNBT string (optionally projected on the keep paths)."""
+    return _parser.parse(snbt_string, keep)
+
+
+def _parse_chunk(strings: list[str], skip_errors: bool) -> list[Any]:
+    """Parse a chunk of SNBT strings (runs inside parse_many's worker processes)."""
+    if not skip_errors:
+        return [_parser.parse(s) for s in strings]
+    results = []
+    for s in strings:
+        try:
+            results.append(_parser.parse(s))
+        except SNBTError:
+            results.append(None)
+    return results
+
+
+def _start_method() -> str:
+    """multiprocessing's start method, without fixing it the way get_start_method() does."""
+    # The first supported method is the default until the script picks one
+    return multiprocessing.get_start_method(allow_none=True) or multiprocessing.get_all_start_methods()[0]
+
+
+def parse_many(snbt_strings: Iterable[str], workers: int | None = None, threshold: int = 2000,
+               chunk_size: int | None = None, skip_errors: bool = False) -> list[Any]:
+    """
+    Parse many SNBT strings, fanning out to a process pool for large batches.
+
+    The pool is only used when multiprocessing's start method is "fork" (the
+    default on Linux before Python 3.14). With "spawn" or "forkserver" (Windows,
+    macOS, newer Linux Pythons) every worker re-imports the calling script, which
+    would run its top-level code (game commands included) again and fail unless
+    it is guarded by `if __name__ == "__main__":`, so there the batch is always
+    parsed inline in this process.
+
+    Args:
+        snbt_strings: SNBT strings to parse
+        workers: Number of worker processes (default: os.cpu_count())
+        threshold: Batches smaller than this are parsed inline in this process
+        chunk_size: Strings sent to a worker at a time (default: about 4 chunks per worker)
+        skip_errors: If True, invalid strings give None instead of raising SNBTError
+
+    Returns:
+        list: Parsed objects, in the same order as the input
+    """
+    strings = list(snbt_strings)
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or len(strings) < threshold or _start_method() != "fork":
+        return _parse_chunk(strings, skip_errors)
+
+    if chunk_size is None:
+        chunk_size = max(1, -(-len(strings) // (workers * 4)))
+    chunks = [strings[i:i + chunk_size] for i in range(0, len(strings), chunk_size)]
+    results = []
+    with ProcessPoolExecutor(max_workers=min(workers, len(chunks)),
+                             mp_context=multiprocessing.get_context("fork")) as executor:
+        for parsed in executor.map(_parse_chunk, chunks, [skip_errors] * len(chunks)):
+            results.extend(parsed)
+    return results
+
+
+def set_parse_cache_size(size: int) -> None:
+    """Enable (size > 0), resize or disable (0) the parse cache used by parse_snbt."""
+    _parser.set_cache_size(size)
+
+
+def parse_cache_info() -> CacheInfo:
+    """Return the (hits, misses, maxsize, currsize) statistics of parse_snbt's cache."""
+    return _parser.cache_info()
 
 
 def to_snbt(obj: Any, pretty: bool = False) -> str:
@@ -362,11 +1375,26 @@ def to_snbt(obj: Any, pretty: bool = False) -> str:
     return _parser.to_snbt(obj, pretty)
 
 
+def dump_snbt(obj: Any, fp: TextIO, pretty: bool = False) -> None:
+    """Quick function to write object as SNBT to a file-like object."""
+    _parser.dump(obj, fp, pretty)
+
+
+def snbt_fingerprint(snbt_string: str) -> str:
+    """Quick function to get a stable content hash of an SNBT string (see SNBTParser.fingerprint)."""
+    return _parser.fingerprint(snbt_string)
+
+
 def get_nbt_value(obj: dict, path: str, default=None) -> Any:
     """Quick function to get value from parsed SNBT using dot notation."""
     return _parser.get(obj, path, default)
 
 
+def extract_snbt(snbt_string: str, path: str, default=None) -> Any:
+    """Quick function to get one value from an SNBT string without parsing all of it."""
+    return _parser.extract(snbt_string, path, default)
+
+
 def set_nbt_value(obj: dict, path: str, value: Any) -> None:
     """Quick function to set value in parsed SNBT using dot notation."""
     _parser.set(obj, path, value)
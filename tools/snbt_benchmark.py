@@ -0,0 +1,261 @@
+"""
+    SNBT Benchmark
+    Version: 0.2
+    Author: RazrCraft
+    Date: 2026-10-17
+
+    Offline benchmark for lib/snbt_parser.py and lib/snbt_reader.py (no game needed).
+
+    A corpus of item and entity SNBT is generated with a fixed seed: enchanted
+    gear, written books with long pages, shulker boxes full of items and mob
+    entity data, each at several sizes. For every module it measures parse,
+    path get, to_snbt (snbt_parser only) and the memory held by the parsed trees,
+    and writes the numbers as JSON. Before timing a module on a corpus, the
+    PATHS lookups are checked on every parsed tree; a module that mis-parses
+    the corpus is reported as FAILED there and not timed, so broken parses
+    don't show up as fast ones.
+
+    Usage:
+    python tools/snbt_benchmark.py [-o results.json] [--quick]
+    python tools/snbt_benchmark.py --baseline old.json [--tolerance 0.15]
+    With --baseline, timings more than tolerance slower than the baseline are
+    reported and the exit code is 1, so it can be used to catch regressions.
+"""
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import timeit
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "lib"))
+
+import snbt_parser  # noqa: E402  pylint: disable=wrong-import-position
+import snbt_reader  # noqa: E402  pylint: disable=wrong-import-position
+
+
+ENCHANTMENTS = ["sharpness", "unbreaking", "mending", "looting", "fire_aspect", "sweeping_edge",
+                "protection", "thorns", "efficiency", "fortune", "silk_touch", "knockback"]
+ITEMS = ["stone", "dirt", "diamond", "iron_ingot", "oak_log", "redstone", "emerald", "gold_block",
+         "netherite_sword", "diamond_pickaxe", "bread", "torch"]
+WORDS = ("lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor "
+         "incididunt ut labore et dolore magna aliqua").split()
+
+# Paths read in the "get" benchmark, per corpus category
+PATHS = {
+    "enchanted_gear": ["components.minecraft:enchantments.levels.minecraft:sharpness",
+                       "components.minecraft:custom_name", "id"],
+    "written_book": ["components.minecraft:written_book_content.author", "count"],
+    "shulker_box": ["components.minecraft:container.0.item.id", "id"],
+    "entity": ["Health", "Attributes.0.id", "Pos.1"],
+}
+
+
+def _text(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+def _quoted(text: str) -> str:
+    return "'" + text.replace("\\", "\\\\").replace("'", "\\'") + "'"
+
+
+def gen_enchanted_gear(rng: random.Random, size: int) -> str:
+    # Sharpness is always present: PATHS reads it
+    chosen = ["sharpness"] + rng.sample(ENCHANTMENTS[1:], min(size, len(ENCHANTMENTS)) - 1)
+    levels = ",".join(f'"minecraft:{e}":{rng.randint(1, 5)}' for e in chosen)
+    lore = ",".join(_quoted(json.dumps({"text": _text(rng, 6), "color": "gray", "italic": False}))
+                    for _ in range(size))
+    name = _quoted(json.dumps({"text": _text(rng, 2), "color": "gold"}))
+    return ('{components:{"minecraft:enchantments":{levels:{' + levels + '}},'
+            f'"minecraft:lore":[{lore}],"minecraft:custom_name":{name},'
+            f'"minecraft:damage":{rng.randint(0, 1500)},"minecraft:repair_cost":{rng.randint(0, 39)}}},'
+            f'count:1,id:"minecraft:{rng.choice(["diamond_sword", "netherite_chestplate"])}"}}')
+
+
+def gen_written_book(rng: random.Random, size: int) -> str:
+    pages = ",".join("{raw:" + _quoted(json.dumps({"text": _text(rng, 60)})) + "}" for _ in range(size))
+    return ('{components:{"minecraft:written_book_content":{author:"RazrCraft",generation:0,'
+            f'pages:[{pages}],resolved:1b,title:{{raw:"Book"}}}}}},count:1,id:"minecraft:written_book"}}')
+
+
+def gen_shulker_box(rng: random.Random, size: int) -> str:
+    slots = []
+    for slot in range(min(size, 27)):
+        item = rng.choice(ITEMS)
+        extra = ""
+        if rng.random() < 0.3:
+            extra = ',components:{"minecraft:custom_name":' + _quoted(json.dumps({"text": _text(rng, 2)})) + "}"
+        slots.append(f'{{item:{{count:{rng.randint(1, 64)},id:"minecraft:{item}"{extra}}},slot:{slot}}}')
+    return ('{components:{"minecraft:container":[' + ",".join(slots) + ']},'
+            'count:1,id:"minecraft:shulker_box"}')
+
+
+def gen_entity(rng: random.Random, size: int) -> str:
+    uuid = ",".join(str(rng.randint(-2**31, 2**31 - 1)) for _ in range(4))
+    attributes = ",".join(f'{{base:{rng.random():.3f}d,id:"minecraft:attr_{i}"}}' for i in range(size))
+    inventory = ",".join(f'{{Slot:{i}b,count:{rng.randint(1, 64)},id:"minecraft:{rng.choice(ITEMS)}"}}'
+                         for i in range(size))
+    return (f'{{Health:{rng.uniform(1, 20):.1f}f,Pos:[{rng.uniform(-1e4, 1e4):.3f}d,64.0d,'
+            f'{rng.uniform(-1e4, 1e4):.3f}d],Motion:[0.0d,-0.078d,0.0d],Rotation:[90.0f,0.0f],'
+            f'UUID:[I;{uuid}],Attributes:[{attributes}],Inventory:[{inventory}],'
+            f'Tags:["custom_mob","builder"],OnGround:1b,id:"minecraft:zombie"}}')
+
+
+GENERATORS = {
+    "enchanted_gear": gen_enchanted_gear,
+    "written_book": gen_written_book,
+    "shulker_box": gen_shulker_box,
+    "entity": gen_entity,
+}
+
+
+def build_corpus(sizes: list[int], per_size: int, seed: int = 1234) -> dict[str, list[str]]:
+    """Generate the SNBT corpus: {"category/size": [snbt, ...]}."""
+    rng = random.Random(seed)
+    corpus = {}
+    for name, gen in GENERATORS.items():
+        for size in sizes:
+            corpus[f"{name}/{size}"] = [gen(rng, size) for _ in range(per_size)]
+    return corpus
+
+
+def _time(func, repeat: int) -> float:
+    """Best-of-repeat seconds for one call of func."""
+    number = 1
+    while True:
+        elapsed = timeit.timeit(func, number=number)
+        if elapsed >= 0.05 or number >= 1 << 16:
+            break
+        number *= 2
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number
+
+
+def _memory(func) -> int:
+    """Bytes still allocated by the result of func (the parsed trees)."""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        result = func()
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del result
+    return after - before
+
+
+def _check(mod, strings: list[str], paths: list[str]) -> tuple[list, str | None]:
+    """Parse strings with mod and check every path resolves; return (trees, error)."""
+    try:
+        trees = [mod.parse_snbt(s) for s in strings]
+    except Exception as e:  # pylint: disable=broad-except
+        return [], f"parse failed: {e}"
+    for i, tree in enumerate(trees):
+        for path in paths:
+            try:
+                value = mod.get_nbt_value(tree, path)
+            except Exception as e:  # pylint: disable=broad-except
+                return trees, f"item {i}: get {path!r} failed: {e}"
+            if value is None:
+                return trees, f"item {i}: {path!r} not found"
+    return trees, None
+
+
+def run(corpus: dict[str, list[str]], repeat: int) -> list[dict]:
+    """Run every benchmark and return one record per (module, corpus, operation)."""
+    modules = {"snbt_parser": snbt_parser, "snbt_reader": snbt_reader}
+    results = []
+    for key, strings in corpus.items():
+        category = key.split("/")[0]
+        paths = PATHS[category]
+        n = len(strings)
+        chars = sum(len(s) for s in strings)
+        for mod_name, mod in modules.items():
+            parse = mod.parse_snbt
+            get = mod.get_nbt_value
+            trees, error = _check(mod, strings, paths)
+            if error is not None:
+                results.append({"module": mod_name, "corpus": key, "op": "check", "items": n, "chars": chars,
+                                "error": error})
+                continue
+
+            def record(op, seconds, **extra):
+                results.append({"module": mod_name, "corpus": key, "op": op, "items": n, "chars": chars,
+                                "seconds": seconds, "us_per_item": seconds / n * 1e6, **extra})
+
+            record("parse", _time(lambda: [parse(s) for s in strings], repeat))
+            record("get", _time(lambda: [get(t, p) for t in trees for p in paths], repeat),
+                   paths=len(paths))
+            if hasattr(mod, "to_snbt"):
+                record("to_snbt", _time(lambda: [mod.to_snbt(t) for t in trees], repeat))
+            if hasattr(mod, "extract_snbt"):
+                record("extract", _time(lambda: [mod.extract_snbt(s, p) for s in strings for p in paths], repeat),
+                       paths=len(paths))
+            results.append({"module": mod_name, "corpus": key, "op": "memory", "items": n, "chars": chars,
+                            "bytes": _memory(lambda: [parse(s) for s in strings])})
+    return results
+
+
+def compare(results: list[dict], baseline: list[dict], tolerance: float) -> list[str]:
+    """Return a message for every timing slower than baseline by more than tolerance."""
+    old = {(r["module"], r["corpus"], r["op"]): r for r in baseline if "seconds" in r}
+    regressions = []
+    for r in results:
+        ref = old.get((r["module"], r["corpus"], r["op"]))
+        if ref is None or "seconds" not in r:
+            continue
+        ratio = r["seconds"] / ref["seconds"]
+        if ratio > 1 + tolerance:
+            regressions.append(f"{r['module']} {r['op']} {r['corpus']}: {ratio:.2f}x slower")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the SNBT modules on a generated corpus.")
+    parser.add_argument("-o", "--output", default="snbt_bench.json", help="JSON results file")
+    parser.add_argument("--quick", action="store_true", help="smaller corpus and fewer repeats")
+    parser.add_argument("--baseline", help="previous results file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="allowed slowdown vs baseline (0.15 = 15%%)")
+    args = parser.parse_args()
+
+    sizes = [1, 8] if args.quick else [1, 8, 27]
+    per_size = 20 if args.quick else 100
+    repeat = 3 if args.quick else 5
+
+    corpus = build_corpus(sizes, per_size)
+    started = time.time()
+    results = run(corpus, repeat)
+    report = {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "duration": round(time.time() - started, 2),
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    for r in results:
+        if "error" in r:
+            print(f"{r['module']:12} {'FAILED':8} {r['corpus']:18} {r['error']}")
+        elif "seconds" in r:
+            print(f"{r['module']:12} {r['op']:8} {r['corpus']:18} {r['us_per_item']:10.1f} us/item")
+        else:
+            print(f"{r['module']:12} {r['op']:8} {r['corpus']:18} {r['bytes'] / r['items']:10.0f} bytes/item")
+    print(f"\nResults written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            regressions = compare(results, json.load(f)["results"], args.tolerance)
+        for line in regressions:
+            print("REGRESSION:", line)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())